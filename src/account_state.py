@@ -0,0 +1,205 @@
+import threading
+import time
+
+from src.binance_client import BinanceFuturesClient
+from src.config import ACCOUNT_POLL_INTERVAL, DEFAULT_POSITION_SIDE
+from src.models import FillTracker
+from src.validator import ValidationError
+from src.logger_utils import get_logger
+
+logger = get_logger("account_state")
+
+
+class Position:
+    __slots__ = ("symbol", "position_side", "amount", "entry_price", "mark_price", "unrealized_pnl")
+
+    def __init__(self, symbol, position_side, amount, entry_price, mark_price=0.0, unrealized_pnl=0.0):
+        self.symbol = symbol
+        self.position_side = position_side
+        self.amount = amount
+        self.entry_price = entry_price
+        self.mark_price = mark_price
+        self.unrealized_pnl = unrealized_pnl
+
+    @property
+    def notional(self):
+        return abs(self.amount) * (self.mark_price or self.entry_price)
+
+
+class Balance:
+    __slots__ = ("asset", "wallet_balance", "cross_wallet_balance", "available_balance")
+
+    def __init__(self, asset, wallet_balance, cross_wallet_balance, available_balance):
+        self.asset = asset
+        self.wallet_balance = wallet_balance
+        self.cross_wallet_balance = cross_wallet_balance
+        self.available_balance = available_balance
+
+
+class AccountStateCache:
+    def __init__(self, client=None):
+        self.client = client or BinanceFuturesClient()
+        self._positions = {}
+        self._balances = {}
+        self._lock = threading.Lock()
+        self._stream = None
+        self._fills = FillTracker()
+        self.updated_at = 0.0
+        # orders placed through this client update positions between polls
+        self.client.add_order_listener(self.on_order_update)
+
+    def seed(self):
+        positions = self.client.get_position_risk()
+        balances = self.client.get_balances()
+        with self._lock:
+            self._positions = {}
+            self._balances = {}
+            for p in positions:
+                self._store_position_row(p)
+            for b in balances:
+                self._store_balance_row(b)
+            self.updated_at = time.time()
+        logger.info(f"Account state seeded: {len(self._positions)} positions, {len(self._balances)} balances")
+        return self
+
+    def refresh(self):
+        positions = self.client.get_position_risk()
+        balances = self.client.get_balances()
+        changed = 0
+        with self._lock:
+            for p in positions:
+                key = (p["symbol"], p.get("positionSide", "BOTH"))
+                current = self._positions.get(key)
+                if current is None or current.amount != float(p["positionAmt"]) or current.entry_price != float(p["entryPrice"]):
+                    changed += 1
+                self._store_position_row(p)
+            for b in balances:
+                current = self._balances.get(b["asset"])
+                if current is None or current.available_balance != float(b["availableBalance"]):
+                    changed += 1
+                self._store_balance_row(b)
+            self.updated_at = time.time()
+        logger.info(f"Account state refreshed: {changed} entries changed")
+        return changed
+
+    def refresh_if_stale(self, max_age=ACCOUNT_POLL_INTERVAL):
+        if time.time() - self.updated_at >= max_age:
+            return self.refresh()
+        return 0
+
+    def _store_position_row(self, p):
+        key = (p["symbol"], p.get("positionSide", "BOTH"))
+        self._positions[key] = Position(
+            symbol=p["symbol"],
+            position_side=key[1],
+            amount=float(p["positionAmt"]),
+            entry_price=float(p["entryPrice"]),
+            mark_price=float(p.get("markPrice", 0)),
+            unrealized_pnl=float(p.get("unRealizedProfit", 0)),
+        )
+
+    def _store_balance_row(self, b):
+        self._balances[b["asset"]] = Balance(
+            asset=b["asset"],
+            wallet_balance=float(b["balance"]),
+            cross_wallet_balance=float(b.get("crossWalletBalance", b["balance"])),
+            available_balance=float(b["availableBalance"]),
+        )
+
+    def apply_event(self, event):
+        if event.get("e") != "ACCOUNT_UPDATE":
+            return
+        data = event.get("a", {})
+        with self._lock:
+            for b in data.get("B", []):
+                wallet = float(b["wb"])
+                cross = float(b["cw"])
+                current = self._balances.get(b["a"])
+                if current is None:
+                    self._balances[b["a"]] = Balance(b["a"], wallet, cross, cross)
+                else:
+                    # availableBalance is not streamed; shift it by the cross wallet delta until the next poll
+                    current.available_balance += cross - current.cross_wallet_balance
+                    current.wallet_balance = wallet
+                    current.cross_wallet_balance = cross
+            for p in data.get("P", []):
+                key = (p["s"], p.get("ps", "BOTH"))
+                current = self._positions.get(key)
+                amount = float(p["pa"])
+                entry = float(p["ep"])
+                if current is None:
+                    self._positions[key] = Position(key[0], key[1], amount, entry, unrealized_pnl=float(p.get("up", 0)))
+                else:
+                    current.amount = amount
+                    current.entry_price = entry
+                    current.unrealized_pnl = float(p.get("up", 0))
+            self.updated_at = time.time()
+
+    def on_order_update(self, order):
+        if order.symbol is None or order.order_id is None:
+            return
+        with self._lock:
+            delta = self._fills.delta(order)
+            if delta <= 0:
+                return
+            key = (order.symbol, order.position_side or DEFAULT_POSITION_SIDE)
+            signed = delta if order.side == "BUY" else -delta
+            current = self._positions.get(key)
+            if current is None:
+                self._positions[key] = Position(key[0], key[1], signed, order.avg_price or order.price)
+            else:
+                current.amount = round(current.amount + signed, 12)
+
+    def subscribe(self):
+        from src.streams import UserDataStream
+
+        self._stream = UserDataStream(self.client, self.apply_event).start()
+        return self
+
+    def close(self):
+        if self._stream is not None:
+            self._stream.stop()
+            self._stream = None
+
+    def positions(self):
+        return list(self._positions.values())
+
+    def position(self, symbol, position_side=None):
+        return self._positions.get((symbol.upper(), position_side or DEFAULT_POSITION_SIDE))
+
+    def position_amount(self, symbol, position_side=None):
+        p = self.position(symbol, position_side)
+        return p.amount if p else 0.0
+
+    def entry_price(self, symbol, position_side=None):
+        p = self.position(symbol, position_side)
+        return p.entry_price if p else 0.0
+
+    def available_margin(self, asset="USDT"):
+        b = self._balances.get(asset)
+        return b.available_balance if b else 0.0
+
+    def exposure(self, symbol, position_side=None):
+        p = self.position(symbol, position_side)
+        return p.notional if p else 0.0
+
+    def gross_exposure(self):
+        return sum(p.notional for p in list(self._positions.values()))
+
+    def check_reduce_only(self, symbol, side, quantity, position_side=None):
+        if self._stream is None:
+            # without the user stream, positions are only as fresh as the last poll
+            self.refresh_if_stale()
+        position_side = position_side or DEFAULT_POSITION_SIDE
+        amount = self.position_amount(symbol, position_side)
+        side = side.upper()
+        if position_side == "LONG":
+            reduces = side == "SELL" and amount != 0
+        elif position_side == "SHORT":
+            reduces = side == "BUY" and amount != 0
+        else:
+            reduces = (side == "SELL" and amount > 0) or (side == "BUY" and amount < 0)
+        if not reduces:
+            raise ValidationError(f"reduce-only {side} would not reduce {symbol} position {amount}")
+        if float(quantity) > abs(amount):
+            raise ValidationError(f"reduce-only quantity {quantity} exceeds {symbol} position {abs(amount)}")
@@ -0,0 +1,278 @@
+import argparse
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from .. import clock
+from ..binance_client import BinanceFuturesClient, BinanceClientError
+from ..config import GRID_ORDER_RATE, GRID_WORKERS, GRID_RETRY_BACKOFF, GRID_MAX_RETRIES
+from ..models import new_client_order_id
+from ..open_orders import OpenOrderIndex
+from ..rate_limit import RateLimiter
+from ..tracing import traced
+from ..validator import ValidationError, validate_positive, quantize, step_sizes
+from ..logger_utils import get_logger
+from .grid_strategy import _build_grid_prices, _plan_levels
+
+logger = get_logger("grid_orchestrator")
+
+
+def load_grid_specs(path):
+    with open(path) as f:
+        data = json.load(f)
+    specs = data.get("grids", []) if isinstance(data, dict) else data
+    for spec in specs:
+        spec["symbol"] = spec["symbol"].upper()
+        spec.setdefault("side", "BOTH")
+        validate_positive("quantity_per_grid", spec["quantity_per_grid"])
+        validate_positive("lower_price", spec["lower_price"])
+        validate_positive("upper_price", spec["upper_price"])
+        validate_positive("num_grids", spec["num_grids"])
+    return specs
+
+
+class GridRun:
+    def __init__(self, spec):
+        self.spec = spec
+        self.symbol = spec["symbol"]
+        self.prices = []
+        self.orders = {}
+        self.missing = set()
+        self.state = "PENDING"
+        self.placed = 0
+        self.filled = 0
+        self.failed = 0
+        self.cycle_failures = 0
+        self.retries = 0
+        self.retry_at = 0.0
+        self.last_error = None
+        self.updated_at = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, order=None, level=None, error=None):
+        with self._lock:
+            if error is not None:
+                self.failed += 1
+                self.cycle_failures += 1
+                self.last_error = str(error)
+                if level is not None:
+                    self.missing.add(level)
+            else:
+                self.orders[order.order_id] = level
+                self.missing.discard(level)
+                self.placed += 1
+            self.updated_at = time.time()
+
+    def status(self):
+        return {
+            "symbol": self.symbol,
+            "state": self.state,
+            "open_orders": len(self.orders),
+            "missing_levels": len(self.missing),
+            "placed": self.placed,
+            "filled": self.filled,
+            "failed": self.failed,
+            "retries": self.retries,
+            "last_error": self.last_error,
+        }
+
+
+class GridOrchestrator:
+    def __init__(self, specs, client=None, workers=GRID_WORKERS, order_rate=GRID_ORDER_RATE, index=None,
+                 retry_backoff=GRID_RETRY_BACKOFF, max_retries=GRID_MAX_RETRIES):
+        self.client = client or BinanceFuturesClient()
+        self.index = index or OpenOrderIndex(self.client)
+        self.runs = [GridRun(spec) for spec in specs]
+        self.workers = workers
+        self.retry_backoff = retry_backoff
+        self.max_retries = max_retries
+        self.limiter = RateLimiter(order_rate)
+        self._executor = None
+
+    def __enter__(self):
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="grid")
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._executor.shutdown(wait=True)
+        self._executor = None
+
+    def _run_round_robin(self, queues):
+        # interleave per-grid work so every grid gets an equal share of the rate budget
+        futures = []
+        while any(queues):
+            for queue in queues:
+                if queue:
+                    futures.append(self._executor.submit(self._throttled, *queue.pop(0)))
+        for f in futures:
+            f.result()
+
+    def _throttled(self, fn, *args):
+        self.limiter.acquire()
+        fn(*args)
+
+    def _place_level(self, run, level, side):
+        spec = run.spec
+        try:
+            order = self.client.place_limit_order(
+                symbol=run.symbol,
+                side=side,
+                quantity=spec["quantity_per_grid"],
+                price=run.prices[level],
+                time_in_force="GTC",
+                reduce_only=False,
+                client_order_id=new_client_order_id("grid"),
+            )
+            run.record(order, (level, side))
+            self.index.upsert(order)
+        except (ValidationError, BinanceClientError) as exc:
+            logger.error(f"Grid {run.symbol} level {level} failed: {exc}")
+            run.record(level=(level, side), error=exc)
+
+    def _prepare(self):
+        info = self.client.get_exchange_info()
+        symbols = {s["symbol"]: s for s in info.get("symbols", [])}
+        for run in self.runs:
+            spec = run.spec
+            symbol_info = symbols.get(run.symbol)
+            if symbol_info is None:
+                run.state = "FAILED"
+                run.last_error = f"Symbol {run.symbol} not found"
+                continue
+            step, tick = step_sizes(symbol_info.get("filters", []))
+            spec["quantity_per_grid"] = quantize(spec["quantity_per_grid"], step)
+            prices = _build_grid_prices(spec["lower_price"], spec["upper_price"], spec["num_grids"])
+            run.prices = [quantize(p, tick) for p in prices]
+
+    @traced("GridOrchestrator.build")
+    def build(self):
+        self._prepare()
+        queues = []
+        for run in self.runs:
+            if run.state == "FAILED":
+                queues.append([])
+                continue
+            run.state = "BUILDING"
+            run.cycle_failures = 0
+            queues.append(self._plan_run(run))
+        self._run_round_robin(queues)
+        for run in self.runs:
+            if run.state != "FAILED":
+                self._update_health(run)
+        return self.status()
+
+    def _plan_run(self, run):
+        return [(self._place_level, run, level, side) for level, side, _ in _plan_levels(run.prices, run.spec["side"])]
+
+    def _sync_run(self, run):
+        if run.state == "RETRYING" and not run.orders:
+            # an idle grid whose last cycle failed is rebuilt from its plan
+            run.missing.clear()
+            return self._plan_run(run)
+        open_ids = self.index.order_ids(run.symbol)
+        # levels whose placement failed earlier are queued again
+        wanted = set(run.missing)
+        actions = []
+        for order_id in [i for i in run.orders if i not in open_ids]:
+            try:
+                self.limiter.acquire()
+                order = self.client.get_order(run.symbol, order_id=order_id)
+            except BinanceClientError as exc:
+                # keep tracking the level; it is queried again next cycle
+                run.record(error=exc)
+                continue
+            level, side = run.orders.pop(order_id)
+            if order.status == "FILLED":
+                run.filled += 1
+                # a filled level is replaced by the opposite side one level away
+                if side == "BUY" and level + 1 < len(run.prices):
+                    wanted.add((level + 1, "SELL"))
+                elif side == "SELL" and level > 0:
+                    wanted.add((level - 1, "BUY"))
+            else:
+                wanted.add((level, side))
+        wanted -= set(run.orders.values())
+        return [(self._place_level, run, level, side) for level, side in sorted(wanted)]
+
+    @traced("GridOrchestrator.maintain")
+    def maintain(self):
+        now = clock.now()
+        active = [run for run in self.runs if run.state != "FAILED" and run.retry_at <= now]
+        for run in active:
+            run.cycle_failures = 0
+        if not self.index.live:
+            # one account-wide snapshot covers every grid
+            try:
+                self.limiter.acquire()
+                self.index.seed()
+            except BinanceClientError as exc:
+                for run in active:
+                    run.record(error=exc)
+                    self._update_health(run)
+                return self.status()
+        futures = [self._executor.submit(self._sync_run, run) for run in active]
+        queues = [f.result() for f in futures]
+        self._run_round_robin(queues)
+        for run in active:
+            self._update_health(run)
+        return self.status()
+
+    def _update_health(self, run):
+        if run.cycle_failures == 0 and not run.missing:
+            run.state = "RUNNING"
+            run.retries = 0
+            run.retry_at = 0.0
+        elif run.orders:
+            # some levels are placed but others failed or are still missing
+            run.state = "DEGRADED"
+        elif run.retries < self.max_retries:
+            # idle grids back off exponentially instead of failing on one bad cycle
+            run.retries += 1
+            run.retry_at = clock.now() + self.retry_backoff * 2 ** (run.retries - 1)
+            run.state = "RETRYING"
+        else:
+            run.state = "FAILED"
+
+    def status(self):
+        return [run.status() for run in self.runs]
+
+
+def print_status(statuses):
+    print(f"{'SYMBOL':<12} {'STATE':<9} {'OPEN':>5} {'MISSING':>7} {'PLACED':>6} {'FILLED':>6} {'FAILED':>6}  LAST ERROR")
+    for s in statuses:
+        print(f"{s['symbol']:<12} {s['state']:<9} {s['open_orders']:>5} {s['missing_levels']:>7} {s['placed']:>6} {s['filled']:>6} {s['failed']:>6}  {s['last_error'] or ''}")
+
+
+def run_orchestrator(config_path, interval=30.0, cycles=0, workers=GRID_WORKERS, order_rate=GRID_ORDER_RATE, client=None):
+    specs = load_grid_specs(config_path)
+    with GridOrchestrator(specs, client=client, workers=workers, order_rate=order_rate) as orchestrator:
+        print_status(orchestrator.build())
+        cycle = 0
+        while cycles == 0 or cycle < cycles:
+            clock.sleep(interval)
+            print_status(orchestrator.maintain())
+            cycle += 1
+        return orchestrator.status()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run many grids concurrently")
+    parser.add_argument("config", help="JSON file with grid specs")
+    parser.add_argument("--interval", type=float, default=30.0, help="Seconds between maintenance cycles")
+    parser.add_argument("--cycles", type=int, default=0, help="Maintenance cycles to run (0 = forever)")
+    parser.add_argument("--workers", type=int, default=GRID_WORKERS, help="Worker threads")
+    parser.add_argument("--order-rate", type=float, default=GRID_ORDER_RATE, help="Shared requests per second")
+    args = parser.parse_args()
+
+    try:
+        run_orchestrator(args.config, args.interval, args.cycles, args.workers, args.order_rate)
+    except (ValidationError, BinanceClientError) as exc:
+        logger.error(f"Grid orchestrator error: {str(exc)}")
+        print(f"Error: {exc}")
+    except KeyboardInterrupt:
+        print("Grid orchestrator stopped by user")
+
+
+if __name__ == "__main__":
+    main()
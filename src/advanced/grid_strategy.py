@@ -1,5 +1,7 @@
 import argparse
 from ..binance_client import BinanceFuturesClient, BinanceClientError
+from ..models import new_client_order_id
+from ..tracing import traced
 from ..validator import ValidationError, validate_positive
 from ..logger_utils import get_logger
 
@@ -15,10 +17,31 @@ def _build_grid_prices(lower, upper, levels):
     return [lower + i * step for i in range(levels)]
 
 
+def _plan_levels(prices, side="BOTH"):
+    mid_index = len(prices) // 2
+    plan = []
+    for i, p in enumerate(prices):
+        if side == "BUY":
+            grid_side = "BUY"
+        elif side == "SELL":
+            grid_side = "SELL"
+        else:
+            if i < mid_index:
+                grid_side = "BUY"
+            elif i > mid_index:
+                grid_side = "SELL"
+            else:
+                continue
+        plan.append((i, grid_side, p))
+    return plan
+
+
 class GridStrategy:
-    def __init__(self, client=None):
+    def __init__(self, client=None, index=None):
         self.client = client or BinanceFuturesClient()
+        self.index = index
 
+    @traced("GridStrategy.create_grid")
     def create_grid(self, symbol, lower_price, upper_price, num_grids, quantity_per_grid, side="BOTH"):
         validate_positive("quantity_per_grid", quantity_per_grid)
         validate_positive("lower_price", lower_price)
@@ -27,21 +50,8 @@ class GridStrategy:
 
         prices = _build_grid_prices(lower_price, upper_price, num_grids)
         orders = []
-        mid_index = len(prices) // 2
-
-        for i, p in enumerate(prices):
-            if side == "BUY":
-                grid_side = "BUY"
-            elif side == "SELL":
-                grid_side = "SELL"
-            else:
-                if i < mid_index:
-                    grid_side = "BUY"
-                elif i > mid_index:
-                    grid_side = "SELL"
-                else:
-                    continue
 
+        for _, grid_side, p in _plan_levels(prices, side):
             res = self.client.place_limit_order(
                 symbol=symbol,
                 side=grid_side,
@@ -49,15 +59,26 @@ class GridStrategy:
                 price=p,
                 time_in_force="GTC",
                 reduce_only=False,
+                client_order_id=new_client_order_id("grid"),
             )
             orders.append(res)
+            if self.index is not None:
+                self.index.upsert(res)
 
         return orders
 
+    @traced("GridStrategy.get_grid_status")
     def get_grid_status(self, symbol):
-        all_orders = self.client._request("GET", "/fapi/v1/openOrders", params={"symbol": symbol.upper()}, signed=True)
-        buy_count = sum(1 for o in all_orders if o.get("side") == "BUY")
-        sell_count = sum(1 for o in all_orders if o.get("side") == "SELL")
+        if self.index is not None:
+            return {
+                "symbol": symbol.upper(),
+                "total_open_orders": self.index.count(symbol, strategy="grid"),
+                "buy_orders": self.index.count(symbol, side="BUY", strategy="grid"),
+                "sell_orders": self.index.count(symbol, side="SELL", strategy="grid"),
+            }
+        all_orders = self.client.get_open_orders(symbol)
+        buy_count = sum(1 for o in all_orders if o.side == "BUY")
+        sell_count = sum(1 for o in all_orders if o.side == "SELL")
         return {
             "symbol": symbol.upper(),
             "total_open_orders": len(all_orders),
@@ -114,7 +135,7 @@ def main():
 
         print(f"Placed {len(orders)} grid orders")
         for o in orders:
-            print(f"  orderId={o.get('orderId')}, side={o.get('side')}, price={o.get('price')}")
+            print(f"  orderId={o.order_id}, side={o.side}, price={o.price}")
 
     except (ValidationError, BinanceClientError) as exc:
         logger.error(f"Grid error: {str(exc)}")
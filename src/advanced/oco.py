@@ -1,6 +1,8 @@
 import argparse
-import time
+from .. import clock
 from ..binance_client import BinanceFuturesClient, BinanceClientError
+from ..models import new_client_order_id
+from ..tracing import traced
 from ..validator import ValidationError
 from ..logger_utils import get_logger
 
@@ -16,6 +18,7 @@ class OCOOrder:
     def __init__(self, client=None):
         self.client = client or BinanceFuturesClient()
 
+    @traced("OCOOrder.place_order")
     def place_order(self, symbol, side, quantity, take_profit_price, stop_loss_price, stop_limit_price=None):
         try:
             tp_res = self.client.place_limit_order(
@@ -25,34 +28,34 @@ class OCOOrder:
                 price=take_profit_price,
                 time_in_force="GTC",
                 reduce_only=False,
+                client_order_id=new_client_order_id("oco"),
             )
-            tp_id = tp_res["orderId"]
-
-            sl_params = {
-                "symbol": symbol.upper(),
-                "side": side.upper(),
-                "type": "STOP_MARKET",
-                "stopPrice": stop_loss_price,
-                "quantity": quantity,
-                "positionSide": "BOTH",
-                "reduceOnly": "false",
-            }
             if stop_limit_price:
-                sl_params["type"] = "STOP"
-                sl_params["price"] = stop_limit_price
-
-            sl_res = self.client._request("POST", "/fapi/v1/order", params=sl_params, signed=True)
-            sl_id = sl_res["orderId"]
+                sl_res = self.client.place_stop_limit_order(
+                    symbol=symbol,
+                    side=side,
+                    quantity=quantity,
+                    stop_price=stop_loss_price,
+                    limit_price=stop_limit_price,
+                    reduce_only=False,
+                    client_order_id=new_client_order_id("oco"),
+                )
+            else:
+                sl_res = self.client.place_stop_market_order(
+                    symbol=symbol,
+                    side=side,
+                    quantity=quantity,
+                    stop_price=stop_loss_price,
+                    reduce_only=False,
+                    client_order_id=new_client_order_id("oco"),
+                )
 
             return {
-                "orderListId": f"oco_{tp_id}_{sl_id}",
+                "orderListId": f"oco_{tp_res.order_id}_{sl_res.order_id}",
                 "symbol": symbol.upper(),
                 "side": side.upper(),
                 "quantity": quantity,
-                "orders": [
-                    {"orderId": tp_id, "type": "LIMIT", "price": take_profit_price},
-                    {"orderId": sl_id, "type": sl_params["type"], "stopPrice": stop_loss_price}
-                ]
+                "orders": [tp_res, sl_res],
             }
         except (ValidationError, BinanceClientError) as exc:
             logger.error(f"OCO failed: {str(exc)}")
@@ -81,28 +84,26 @@ def main():
             position_side=args.position_side,
             reduce_only=args.reduce_only,
         )
-        tp_id = tp_res["orderId"]
-
-        sl_params = {
-            "symbol": args.symbol.upper(),
-            "side": args.side.upper(),
-            "type": "STOP_MARKET",
-            "stopPrice": args.stop_loss_price,
-            "quantity": args.quantity,
-            "positionSide": args.position_side or "BOTH",
-            "reduceOnly": "true" if args.reduce_only else "false",
-        }
-        sl_res = client._request("POST", "/fapi/v1/order", params=sl_params, signed=True)
-        sl_id = sl_res["orderId"]
+        tp_id = tp_res.order_id
+
+        sl_res = client.place_stop_market_order(
+            symbol=args.symbol,
+            side=args.side,
+            quantity=args.quantity,
+            stop_price=args.stop_loss_price,
+            position_side=args.position_side,
+            reduce_only=args.reduce_only,
+        )
+        sl_id = sl_res.order_id
 
         print(f"OCO created. TP orderId={tp_id}, SL orderId={sl_id}")
 
         while True:
-            time.sleep(POLL_INTERVAL)
+            clock.sleep(POLL_INTERVAL)
             tp = client.get_order(args.symbol, order_id=tp_id)
             sl = client.get_order(args.symbol, order_id=sl_id)
-            tp_status = tp.get("status")
-            sl_status = sl.get("status")
+            tp_status = tp.status
+            sl_status = sl.status
 
             if _is_terminal(tp_status) or _is_terminal(sl_status):
                 if not _is_terminal(tp_status):
@@ -1,5 +1,6 @@
 import argparse
 from ..binance_client import BinanceFuturesClient, BinanceClientError
+from ..tracing import traced
 from ..validator import ValidationError
 from ..logger_utils import get_logger
 
@@ -7,10 +8,14 @@ logger = get_logger("stop_limit")
 
 
 class StopLimitOrder:
-    def __init__(self, client=None):
+    def __init__(self, client=None, account=None):
         self.client = client or BinanceFuturesClient()
+        self.account = account
 
+    @traced("StopLimitOrder.place_order")
     def place_order(self, symbol, side, quantity, stop_price, limit_price, time_in_force="GTC", reduce_only=False):
+        if reduce_only and self.account is not None:
+            self.account.check_reduce_only(symbol, side, quantity)
         return self.client.place_stop_limit_order(
             symbol=symbol,
             side=side,
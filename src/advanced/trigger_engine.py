@@ -0,0 +1,460 @@
+import argparse
+import itertools
+import random
+import threading
+import time
+from bisect import bisect_left, insort
+from collections import deque
+from heapq import heapify, heappop, heappush
+
+from ..binance_client import BinanceFuturesClient, BinanceClientError
+from ..config import TRIGGER_MAX_ATTEMPTS
+from ..models import new_client_order_id
+from ..validator import ValidationError, validate_positive, validate_side
+from ..logger_utils import get_logger
+
+logger = get_logger("trigger_engine")
+
+
+class Trigger:
+    __slots__ = ("trigger_id", "symbol", "side", "quantity", "kind", "trigger_price", "limit_price", "trail",
+                 "reduce_only", "state", "siblings", "order", "error", "attempts", "indexed")
+
+    def __init__(self, trigger_id, symbol, side, quantity, kind, trigger_price=None, limit_price=None, trail=None, reduce_only=False):
+        self.trigger_id = trigger_id
+        self.symbol = symbol
+        self.side = side
+        self.quantity = quantity
+        self.kind = kind
+        self.trigger_price = trigger_price
+        self.limit_price = limit_price
+        self.trail = trail
+        self.reduce_only = reduce_only
+        self.state = "ARMED"
+        self.siblings = ()
+        self.order = None
+        self.error = None
+        self.attempts = 0
+        self.indexed = False
+
+    def __repr__(self):
+        return f"Trigger(id={self.trigger_id}, {self.kind} {self.side} {self.quantity} {self.symbol} @ {self.trigger_price}, state={self.state})"
+
+
+# Both indexes fire when a price x falls to or below a level; rising triggers are
+# stored on the negated price axis so one implementation serves both directions.
+
+class _LevelIndex:
+    def __init__(self):
+        self._entries = []
+
+    def add(self, level, seq, trigger):
+        insort(self._entries, (level, seq, trigger))
+
+    def pop_triggered(self, x):
+        i = bisect_left(self._entries, (x,))
+        if i == len(self._entries):
+            return []
+        fired = [e[2] for e in self._entries[i:]]
+        del self._entries[i:]
+        return fired
+
+    def compact(self, keep):
+        self._entries = [e for e in self._entries if keep(e[2])]
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class _TrailGroup:
+    __slots__ = ("peak", "entries", "level")
+
+    def __init__(self, peak):
+        self.peak = peak
+        self.entries = []
+        self.level = None
+
+
+class _TrailingIndex:
+    # orders armed since the last new high share a peak; each group keeps its
+    # trail distances sorted so the smallest trail (the first to fire) is last,
+    # and a heap on each group's firing level means a tick only visits groups
+    # that fire. Heap entries for merged or re-levelled groups are skipped lazily.
+    def __init__(self):
+        self._groups = []
+        self._heap = []
+        self._seq = itertools.count()
+        self._count = 0
+
+    def _push(self, group):
+        level = group.peak + group.entries[-1][0] if group.entries else None
+        if level is not None and level != group.level:
+            heappush(self._heap, (-level, next(self._seq), group))
+        group.level = level
+
+    def _rebuild_heap(self):
+        self._heap = [(-g.level, next(self._seq), g) for g in self._groups if g.level is not None]
+        heapify(self._heap)
+
+    def add(self, trail, seq, trigger, x):
+        groups = self._groups
+        if groups and groups[-1].peak <= x:
+            group = groups[-1]
+            group.peak = x
+        else:
+            group = _TrailGroup(x)
+            groups.append(group)
+        insort(group.entries, (-trail, seq, trigger))
+        self._count += 1
+        self._push(group)
+
+    def _raise_peak(self, x):
+        groups = self._groups
+        if not groups or groups[-1].peak >= x:
+            return
+        merged = groups.pop()
+        while groups and groups[-1].peak < x:
+            group = groups.pop()
+            if len(group.entries) > len(merged.entries):
+                group, merged = merged, group
+            for entry in group.entries:
+                insort(merged.entries, entry)
+            group.level = None
+        merged.peak = x
+        groups.append(merged)
+        self._push(merged)
+        if len(self._heap) > 2 * len(groups) + 16:
+            self._rebuild_heap()
+
+    def pop_triggered(self, x):
+        self._raise_peak(x)
+        heap = self._heap
+        fired = []
+        while heap and -heap[0][0] >= x:
+            level, _, group = heappop(heap)
+            if group.level != -level:
+                continue
+            entries = group.entries
+            while entries and group.peak + entries[-1][0] >= x:
+                fired.append(entries.pop()[2])
+            group.level = None
+            self._push(group)
+        if fired:
+            self._count -= len(fired)
+            if len(self._groups) > 2 * self._count + 16:
+                self._groups = [g for g in self._groups if g.entries]
+        return fired
+
+    def compact(self, keep):
+        groups = []
+        for group in self._groups:
+            group.entries = [e for e in group.entries if keep(e[2])]
+            group.level = group.peak + group.entries[-1][0] if group.entries else None
+            if group.entries:
+                groups.append(group)
+        self._groups = groups
+        self._count = sum(len(g.entries) for g in groups)
+        self._rebuild_heap()
+
+    def __len__(self):
+        return self._count
+
+
+def _keep_armed(trigger):
+    if trigger.state == "ARMED":
+        return True
+    trigger.indexed = False
+    return False
+
+
+class _SymbolBook:
+    __slots__ = ("falling", "rising", "trailing_falling", "trailing_rising", "last_price", "live", "dead", "retry")
+
+    def __init__(self):
+        self.falling = _LevelIndex()
+        self.rising = _LevelIndex()
+        self.trailing_falling = _TrailingIndex()
+        self.trailing_rising = _TrailingIndex()
+        self.last_price = None
+        self.live = 0
+        self.dead = 0
+        self.retry = []
+
+    def _indexes(self):
+        return (self.falling, self.rising, self.trailing_falling, self.trailing_rising)
+
+    def triggered(self, price):
+        self.last_price = price
+        return (self.falling.pop_triggered(price) + self.rising.pop_triggered(-price)
+                + self.trailing_falling.pop_triggered(price) + self.trailing_rising.pop_triggered(-price))
+
+    def compact(self):
+        for index in self._indexes():
+            index.compact(_keep_armed)
+        self.dead = 0
+
+    def __len__(self):
+        return sum(len(index) for index in self._indexes())
+
+
+class TriggerEngine:
+    def __init__(self, client=None, submitter=None, on_failed=None, max_attempts=TRIGGER_MAX_ATTEMPTS):
+        self.client = client
+        self.submitter = submitter or self._submit
+        self.on_failed = on_failed
+        self.max_attempts = max_attempts
+        self.failed = deque(maxlen=1000)
+        self._books = {}
+        self._armed = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._stream = None
+
+    def _book(self, symbol):
+        book = self._books.get(symbol)
+        if book is None:
+            book = self._books[symbol] = _SymbolBook()
+        return book
+
+    def _new_trigger(self, symbol, side, quantity, kind, **kwargs):
+        validate_side(side)
+        validate_positive("quantity", quantity)
+        trigger = Trigger(next(self._ids), symbol.upper(), side.upper(), quantity, kind, **kwargs)
+        self._armed[trigger.trigger_id] = trigger
+        self._book(trigger.symbol).live += 1
+        return trigger
+
+    def _retire(self, book, trigger, state):
+        trigger.state = state
+        del self._armed[trigger.trigger_id]
+        book.live -= 1
+        if trigger.indexed:
+            # retired entries stay indexed until crossed or compacted
+            book.dead += 1
+
+    def _rearm(self, book, trigger):
+        trigger.state = "ARMED"
+        self._armed[trigger.trigger_id] = trigger
+        book.live += 1
+        if trigger.indexed:
+            book.dead -= 1
+        else:
+            self._index(book, trigger)
+
+    def _compact_if_needed(self, book):
+        if book.dead > 64 and book.dead * 2 > len(book):
+            book.compact()
+
+    def _index(self, book, trigger):
+        trigger.indexed = True
+        if trigger.kind == "TRAILING_STOP":
+            if trigger.side == "SELL":
+                book.trailing_falling.add(trigger.trail, trigger.trigger_id, trigger, book.last_price)
+            else:
+                book.trailing_rising.add(trigger.trail, trigger.trigger_id, trigger, -book.last_price)
+        # stops buy into a rally and sell into a drop; a take profit is the opposite
+        elif (trigger.side == "BUY") != (trigger.kind == "TAKE_PROFIT"):
+            book.rising.add(-trigger.trigger_price, trigger.trigger_id, trigger)
+        else:
+            book.falling.add(trigger.trigger_price, trigger.trigger_id, trigger)
+
+    def arm_stop(self, symbol, side, quantity, stop_price, limit_price=None, reduce_only=False):
+        validate_positive("stop_price", stop_price)
+        with self._lock:
+            trigger = self._new_trigger(symbol, side, quantity, "STOP", trigger_price=stop_price, limit_price=limit_price, reduce_only=reduce_only)
+            self._index(self._book(trigger.symbol), trigger)
+        return trigger
+
+    def arm_trailing_stop(self, symbol, side, quantity, trail, reduce_only=False):
+        validate_positive("trail", trail)
+        with self._lock:
+            book = self._book(symbol.upper())
+            if book.last_price is None:
+                raise ValidationError(f"No price seen for {symbol.upper()} yet")
+            trigger = self._new_trigger(symbol, side, quantity, "TRAILING_STOP", trail=trail, reduce_only=reduce_only)
+            self._index(book, trigger)
+        return trigger
+
+    def arm_bracket(self, symbol, side, quantity, take_profit_price, stop_loss_price, reduce_only=True):
+        validate_positive("take_profit_price", take_profit_price)
+        validate_positive("stop_loss_price", stop_loss_price)
+        with self._lock:
+            take_profit = self._new_trigger(symbol, side, quantity, "TAKE_PROFIT", trigger_price=take_profit_price, reduce_only=reduce_only)
+            stop_loss = self._new_trigger(symbol, side, quantity, "STOP_LOSS", trigger_price=stop_loss_price, reduce_only=reduce_only)
+            take_profit.siblings = (stop_loss,)
+            stop_loss.siblings = (take_profit,)
+            book = self._book(take_profit.symbol)
+            # a SELL bracket exits a long: take profit above, stop loss below
+            self._index(book, take_profit)
+            self._index(book, stop_loss)
+        return take_profit, stop_loss
+
+    def cancel(self, trigger_id):
+        with self._lock:
+            trigger = self._armed.get(trigger_id)
+            if trigger is not None:
+                book = self._books[trigger.symbol]
+                self._retire(book, trigger, "CANCELED")
+                self._compact_if_needed(book)
+        return trigger
+
+    def evaluate(self, symbol, price):
+        fired = []
+        with self._lock:
+            book = self._book(symbol.upper())
+            # triggers whose submit failed are sent again on the next tick
+            for trigger in book.retry:
+                trigger.state = "TRIGGERED"
+                trigger.attempts += 1
+                fired.append(trigger)
+            book.retry = []
+            for trigger in book.triggered(price):
+                trigger.indexed = False
+                if trigger.state != "ARMED":
+                    book.dead -= 1
+                    continue
+                self._retire(book, trigger, "TRIGGERED")
+                trigger.attempts += 1
+                trigger.trigger_price = price if trigger.kind == "TRAILING_STOP" else trigger.trigger_price
+                # siblings are held until the submit succeeds so a failed exit leaves the other leg armed
+                for sibling in trigger.siblings:
+                    if sibling.state == "ARMED":
+                        self._retire(book, sibling, "SUSPENDED")
+                fired.append(trigger)
+            self._compact_if_needed(book)
+        return fired
+
+    def on_tick(self, symbol, price):
+        fired = self.evaluate(symbol, price)
+        for trigger in fired:
+            self.submitter(trigger)
+            if trigger.state == "FAILED":
+                self._submit_failed(trigger)
+            elif trigger.siblings:
+                with self._lock:
+                    for sibling in trigger.siblings:
+                        if sibling.state == "SUSPENDED":
+                            sibling.state = "CANCELED"
+        return fired
+
+    def _submit_failed(self, trigger):
+        with self._lock:
+            book = self._books[trigger.symbol]
+            if trigger.attempts < self.max_attempts:
+                trigger.state = "RETRYING"
+                book.retry.append(trigger)
+                return
+            # out of retries: the other bracket leg goes back to protecting the position
+            for sibling in trigger.siblings:
+                if sibling.state == "SUSPENDED":
+                    self._rearm(book, sibling)
+            self.failed.append(trigger)
+        logger.error(f"Trigger {trigger.trigger_id} failed after {trigger.attempts} attempts: {trigger.error}")
+        if self.on_failed is not None:
+            self.on_failed(trigger)
+
+    def _submit(self, trigger):
+        if self.client is None:
+            self.client = BinanceFuturesClient()
+        try:
+            if trigger.limit_price is not None:
+                trigger.order = self.client.place_limit_order(
+                    symbol=trigger.symbol,
+                    side=trigger.side,
+                    quantity=trigger.quantity,
+                    price=trigger.limit_price,
+                    time_in_force="GTC",
+                    reduce_only=trigger.reduce_only,
+                    client_order_id=new_client_order_id("trigger"),
+                )
+            else:
+                trigger.order = self.client.place_market_order(
+                    symbol=trigger.symbol,
+                    side=trigger.side,
+                    quantity=trigger.quantity,
+                    reduce_only=trigger.reduce_only,
+                    client_order_id=new_client_order_id("trigger"),
+                )
+            logger.info(f"Trigger {trigger.trigger_id} fired: orderId={trigger.order.order_id}")
+        except (ValidationError, BinanceClientError) as exc:
+            trigger.state = "FAILED"
+            trigger.error = str(exc)
+            logger.error(f"Trigger {trigger.trigger_id} submit failed (attempt {trigger.attempts}): {exc}")
+
+    def _on_stream_message(self, message):
+        data = message.get("data", message)
+        if data.get("e") == "markPriceUpdate":
+            self.on_tick(data["s"], float(data["p"]))
+
+    def subscribe(self, symbols):
+        from ..streams import BinanceStream
+
+        streams = "/".join(f"{s.lower()}@markPrice@1s" for s in symbols)
+        self._stream = BinanceStream(f"/stream?streams={streams}", self._on_stream_message).start()
+        return self
+
+    def close(self):
+        if self._stream is not None:
+            self._stream.stop()
+            self._stream = None
+
+    def armed(self, symbol=None):
+        if symbol is None:
+            return len(self._armed)
+        book = self._books.get(symbol.upper())
+        return book.live if book else 0
+
+
+def benchmark(armed, ticks=20000, seed=7, moving=False):
+    rng = random.Random(seed)
+    engine = TriggerEngine(submitter=lambda trigger: None)
+    symbol = "BTCUSDT"
+    price = 50000.0
+    engine.on_tick(symbol, price)
+
+    def arm_one(reference):
+        kind = rng.random()
+        if kind < 0.6:
+            offset = rng.uniform(50, 5000)
+            side = "BUY" if rng.random() < 0.5 else "SELL"
+            engine.arm_stop(symbol, side, 0.01, reference + offset if side == "BUY" else reference - offset)
+        elif kind < 0.8:
+            engine.arm_trailing_stop(symbol, "SELL" if rng.random() < 0.5 else "BUY", 0.01, rng.uniform(50, 5000))
+        else:
+            offset = rng.uniform(50, 5000)
+            engine.arm_bracket(symbol, "SELL", 0.01, reference + offset, reference - offset)
+
+    # a moving run arms between ticks and keeps the book topped up, so trailing
+    # stops are spread over many peaks instead of sharing one
+    while engine.armed() < armed:
+        if moving:
+            price += rng.gauss(0, 5)
+            engine.on_tick(symbol, price)
+        arm_one(price)
+
+    fired = 0
+    start = time.perf_counter()
+    for _ in range(ticks):
+        price += rng.gauss(0, 5)
+        fired += len(engine.on_tick(symbol, price))
+        while moving and engine.armed() < armed:
+            arm_one(price)
+    elapsed = time.perf_counter() - start
+    return ticks / elapsed, fired
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark client-side trigger evaluation")
+    parser.add_argument("--ticks", type=int, default=20000, help="Ticks per run")
+    parser.add_argument("--armed", type=int, nargs="+", default=[1000, 10000, 100000], help="Armed trigger counts")
+    args = parser.parse_args()
+
+    print(f"{'armed':>8} {'price':>7} {'ticks/sec':>12} {'fired':>7}")
+    for armed in args.armed:
+        for moving in (False, True):
+            rate, fired = benchmark(armed, args.ticks, moving=moving)
+            print(f"{armed:>8} {'moving' if moving else 'fixed':>7} {rate:>12,.0f} {fired:>7}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,40 +1,220 @@
 import argparse
-import time
+from decimal import Decimal
+from .. import clock
 from ..binance_client import BinanceFuturesClient, BinanceClientError
-from ..validator import ValidationError, validate_positive
+from ..validator import ValidationError, validate_positive, quantize, step_sizes, min_order_size
+from ..streams import open_market_feed
+from ..models import new_client_order_id
+from ..order_pipeline import OrderPipeline
+from ..tracing import traced
 from ..logger_utils import get_logger
 
 logger = get_logger("twap")
 
+POLL_INTERVAL = 1.0
+URGENCY_FRACTION = 0.2
+PREPARE_AHEAD = 3
+
+
+def implementation_shortfall(side, arrival_price, fills, total_quantity):
+    filled = round(sum(q for q, _ in fills), 12)
+    sign = 1 if side.upper() == "BUY" else -1
+    avg_price = round(sum(q * p for q, p in fills), 12) / filled if filled > 0 else 0.0
+    shortfall_bps = sign * (avg_price - arrival_price) / arrival_price * 10000 if filled > 0 and arrival_price > 0 else 0.0
+    return {
+        "arrival_price": arrival_price,
+        "avg_price": avg_price,
+        "filled_quantity": filled,
+        "unfilled_quantity": max(round(total_quantity - filled, 12), 0.0),
+        "shortfall_bps": shortfall_bps,
+        "shortfall_cost": sign * (avg_price - arrival_price) * filled,
+    }
+
 
 class TWAPOrder:
     def __init__(self, client=None):
         self.client = client or BinanceFuturesClient()
+        self.report = None
+        self.fire_stats = None
 
-    def execute_twap(self, symbol, side, total_quantity, duration_minutes, num_slices=10):
+    @traced("TWAPOrder.execute_twap")
+    def execute_twap(self, symbol, side, total_quantity, duration_minutes, num_slices=10, mode="TWAP", participation_rate=0.1):
         validate_positive("total_quantity", total_quantity)
         validate_positive("duration_minutes", duration_minutes)
         validate_positive("num_slices", num_slices)
 
-        qty_per_slice = total_quantity / num_slices
+        if mode == "ADAPTIVE":
+            validate_positive("participation_rate", participation_rate)
+            return self._execute_adaptive(symbol.upper(), side.upper(), total_quantity, duration_minutes, num_slices, participation_rate)
+
         interval = (duration_minutes * 60) / num_slices
+        pipeline = OrderPipeline(self.client, depth=PREPARE_AHEAD)
+        slices = self._plan_slices(pipeline, symbol.upper(), total_quantity, num_slices)
+        pipeline.schedule({"symbol": symbol, "side": side, "quantity": q, "client_order_id": new_client_order_id("twap")} for q in slices)
 
         orders = []
         for i in range(num_slices):
             logger.info(f"TWAP slice {i+1}/{num_slices}")
-            res = self.client.place_market_order(
-                symbol=symbol,
-                side=side,
-                quantity=qty_per_slice,
-                reduce_only=False,
-            )
+            res = pipeline.fire()
             orders.append(res)
+            pipeline.refill()
             if i < num_slices - 1:
-                time.sleep(interval)
+                clock.sleep(interval)
 
-        logger.info("TWAP completed")
+        self.fire_stats = pipeline.stats.summary()
+        logger.info(f"TWAP completed, fire latency p50 {self.fire_stats['p50_us']:.1f} us")
         return orders
 
+    def _plan_slices(self, pipeline, symbol, total_quantity, num_slices):
+        filters = pipeline.symbol_filters(symbol)
+        step, _ = step_sizes(filters)
+        min_qty, min_notional = min_order_size(filters)
+
+        # slices are whole lot steps; the last one takes the remainder so the total is exact
+        qty_per_slice = quantize(total_quantity / num_slices, step)
+        last_slice = float(Decimal(str(total_quantity)) - Decimal(str(qty_per_slice)) * (num_slices - 1))
+        if last_slice != quantize(last_slice, step):
+            raise ValidationError(f"total_quantity {total_quantity} is not a multiple of stepSize {step} for {symbol}")
+
+        smallest = min(qty_per_slice, last_slice)
+        if smallest <= 0 or smallest < min_qty:
+            raise ValidationError(f"TWAP slice {smallest} < minQty {min_qty} for {symbol}, use fewer slices")
+        if min_notional:
+            if not self.client.risk.has_mark(symbol):
+                self.client.risk.update_mark(symbol, self.client.get_mark_price(symbol))
+            notional = smallest * self.client.risk.mark(symbol)
+            if notional < min_notional:
+                raise ValidationError(f"TWAP slice notional {notional:.4f} < minNotional {min_notional} for {symbol}, use fewer slices")
+        return [qty_per_slice] * (num_slices - 1) + [last_slice]
+
+    def _settle(self, symbol, order):
+        if order.is_terminal:
+            return order
+        return self.client.get_order(symbol, order_id=order.order_id)
+
+    def _cancel_resting(self, symbol, order):
+        try:
+            return self.client.cancel_order(symbol, order_id=order.order_id)
+        except BinanceClientError:
+            # already filled or expired between polls
+            return self.client.get_order(symbol, order_id=order.order_id)
+
+    def _execute_adaptive(self, symbol, side, total_quantity, duration_minutes, num_slices, participation_rate):
+        filters = self.client.get_symbol_filters(symbol).get("filters", [])
+        step, tick = step_sizes(filters)
+        min_qty, min_notional = min_order_size(filters)
+        market = open_market_feed(self.client, symbol)
+        arrival_price = market.mid
+        logger.info(f"Adaptive TWAP arrival price {arrival_price}")
+
+        start = clock.now()
+        interval = (duration_minutes * 60) / num_slices
+        urgency = interval * URGENCY_FRACTION
+        fills = []
+        orders = []
+        filled = 0.0
+        # participation allowance not yet filled passively; small prints accumulate until a child clears the filters
+        budget = 0.0
+        last_volume = market.volume
+        resting = None
+
+        def tradeable(qty, price):
+            return qty > 0 and qty >= min_qty and (not min_notional or qty * price >= min_notional)
+
+        def record(order):
+            nonlocal filled
+            orders.append(order)
+            qty = order.executed_qty
+            if qty > 0:
+                fills.append((qty, order.avg_price))
+                filled = round(filled + qty, 12)
+
+        def settle_resting(order):
+            nonlocal budget
+            record(order)
+            budget = max(budget - order.executed_qty, 0.0)
+
+        try:
+            for i in range(num_slices):
+                deadline = start + (i + 1) * interval
+                target = round(total_quantity * (i + 1) / num_slices, 12)
+                logger.info(f"Adaptive TWAP slice {i+1}/{num_slices}, target {target}")
+
+                while True:
+                    market.update()
+                    traded = market.volume - last_volume
+                    last_volume = market.volume
+                    budget += traded * participation_rate
+                    now = clock.now()
+                    urgent = now >= deadline - urgency
+                    near_price = quantize(market.bid if side == "BUY" else market.ask, tick)
+
+                    if resting is not None and traded > 0:
+                        # only trades can fill the resting order, so it is polled only when the tape moved
+                        state = self.client.get_order(symbol, order_id=resting.order_id)
+                        if state.is_terminal:
+                            settle_resting(state)
+                            resting = None
+
+                    remaining = round(total_quantity - filled, 12)
+                    if resting is not None:
+                        # keep queue priority unless the touch moved or the child outgrew what is left;
+                        # allowance that builds up meanwhile goes into the next child
+                        if urgent or resting.price != near_price or resting.orig_qty > remaining:
+                            settle_resting(self._cancel_resting(symbol, resting))
+                            resting = None
+                            remaining = round(total_quantity - filled, 12)
+
+                    if remaining <= 0 or remaining < min_qty:
+                        break
+                    behind = quantize(round(min(target - filled, remaining), 12), step)
+
+                    if now >= deadline:
+                        if tradeable(behind, market.mid):
+                            order = self.client.place_market_order(symbol=symbol, side=side, quantity=behind, reduce_only=False,
+                                                                   client_order_id=new_client_order_id("twap"))
+                            record(self._settle(symbol, order))
+                        break
+
+                    if urgent:
+                        far_price = quantize(market.ask if side == "BUY" else market.bid, tick)
+                        if tradeable(behind, far_price):
+                            order = self.client.place_limit_order(
+                                symbol=symbol,
+                                side=side,
+                                quantity=behind,
+                                price=far_price,
+                                time_in_force="IOC",
+                                reduce_only=False,
+                                client_order_id=new_client_order_id("twap"),
+                            )
+                            record(self._settle(symbol, order))
+                    elif resting is None:
+                        child = quantize(round(min(budget, remaining), 12), step)
+                        if tradeable(child, near_price):
+                            resting = self.client.place_limit_order(
+                                symbol=symbol,
+                                side=side,
+                                quantity=child,
+                                price=near_price,
+                                time_in_force="GTX",
+                                reduce_only=False,
+                                client_order_id=new_client_order_id("twap"),
+                            )
+                            if resting.is_terminal:
+                                # post-only order rejected for crossing the book
+                                settle_resting(resting)
+                                resting = None
+
+                    clock.sleep(max(min(POLL_INTERVAL, deadline - clock.now()), 0))
+        finally:
+            if resting is not None:
+                record(self._cancel_resting(symbol, resting))
+            market.stop()
+
+        self.report = implementation_shortfall(side, arrival_price, fills, total_quantity)
+        logger.info(f"Adaptive TWAP completed, shortfall {self.report['shortfall_bps']:.2f} bps")
+        return orders
 
 def main():
     parser = argparse.ArgumentParser(description="TWAP strategy")
@@ -66,10 +246,10 @@ def main():
                 position_side=args.position_side,
                 reduce_only=args.reduce_only,
             )
-            print(f"Slice {i+1}/{args.slices} filled: orderId={res.get('orderId')}")
+            print(f"Slice {i+1}/{args.slices} filled: orderId={res.order_id}")
 
             if i < args.slices - 1:
-                time.sleep(interval)
+                clock.sleep(interval)
 
         print("TWAP complete")
 
@@ -1,11 +1,15 @@
 import time
 import hmac
 import hashlib
+import json
 from urllib.parse import urlencode
-import requests
 
-from src.config import BINANCE_API_KEY, BINANCE_API_SECRET, BASE_URL, RECV_WINDOW, DEFAULT_POSITION_SIDE
+from src.config import BINANCE_API_KEY, BINANCE_API_SECRET, BASE_URL, RECV_WINDOW, DEFAULT_POSITION_SIDE, SYMBOL_INFO_TTL
 from src.logger_utils import get_logger
+from src.models import Order, loads
+from src.risk import get_default_risk_engine
+from src.tracing import span, traced
+from src.transport import TransportError, get_default_transport
 from src.validator import validate_symbol, validate_side, validate_with_filters, validate_positive
 
 logger = get_logger("binance_client")
@@ -16,57 +20,71 @@ class BinanceClientError(Exception):
 
 
 class BinanceFuturesClient:
-    def __init__(self):
+    def __init__(self, transport=None, risk=None):
         if not BINANCE_API_KEY or not BINANCE_API_SECRET:
             logger.warning("API keys are not set")
         self.api_key = BINANCE_API_KEY
         self.api_secret = BINANCE_API_SECRET.encode("utf-8")
+        self._mac = hmac.new(self.api_secret, digestmod=hashlib.sha256)
+        self.transport = transport or get_default_transport()
+        self.risk = risk or get_default_risk_engine()
+        self._symbol_info = {}
+        self._order_listeners = []
+
+    def _signature(self, query):
+        mac = self._mac.copy()
+        mac.update(query.encode("utf-8"))
+        return mac.hexdigest()
 
     def _sign(self, params):
         query = urlencode(params, True)
-        signature = hmac.new(self.api_secret, query.encode("utf-8"), hashlib.sha256).hexdigest()
-        params["signature"] = signature
+        params["signature"] = self._signature(query)
         return params
 
+    def _sign_query(self, query):
+        query = f"{query}&timestamp={int(time.time() * 1000)}&recvWindow={RECV_WINDOW}"
+        return f"{query}&signature={self._signature(query)}"
+
     def _headers(self):
         return {"X-MBX-APIKEY": self.api_key}
 
-    def _request(self, method, path, params=None, signed=False):
+    def _request(self, method, path, params=None, signed=False, keyed=False):
+        if method not in ("GET", "POST", "PUT", "DELETE"):
+            raise BinanceClientError(f"Unsupported HTTP method {method}")
         if params is None:
             params = {}
 
         if signed:
-            params.setdefault("timestamp", int(time.time() * 1000))
-            params.setdefault("recvWindow", RECV_WINDOW)
-            params = self._sign(params)
+            with span("sign"):
+                params.setdefault("timestamp", int(time.time() * 1000))
+                params.setdefault("recvWindow", RECV_WINDOW)
+                params = self._sign(params)
+
+        return self._send(method, path, params, self._headers() if signed or keyed else None)
 
+    def _send(self, method, path, params, headers):
         url = f"{BASE_URL}{path}"
 
         logger.info(f"HTTP {method} {path}")
 
         try:
-            if method == "GET":
-                resp = requests.get(url, headers=self._headers() if signed else None, params=params, timeout=10)
-            elif method == "POST":
-                resp = requests.post(url, headers=self._headers() if signed else None, params=params, timeout=10)
-            elif method == "DELETE":
-                resp = requests.delete(url, headers=self._headers() if signed else None, params=params, timeout=10)
-            else:
-                raise BinanceClientError(f"Unsupported HTTP method {method}")
-        except requests.RequestException as exc:
+            with span(f"http {method} {path}"):
+                resp = self.transport.send(method, url, params=params, headers=headers)
+        except TransportError as exc:
             logger.error(f"Network error: {exc}")
             raise BinanceClientError(f"Network error: {exc}") from exc
 
         if resp.status_code >= 400:
             try:
-                data = resp.json()
+                data = loads(resp.content)
             except ValueError:
                 data = {"msg": resp.text}
             logger.error(f"API error {resp.status_code}: {data}")
             raise BinanceClientError(f"API error {resp.status_code}: {data}")
 
         try:
-            data = resp.json()
+            with span("decode"):
+                data = loads(resp.content)
         except ValueError:
             data = resp.text
 
@@ -77,16 +95,36 @@ class BinanceFuturesClient:
         params = {}
         if symbol:
             params["symbol"] = symbol.upper()
-        return self._request("GET", "/fapi/v1/exchangeInfo", params=params, signed=False)
+        info = self._request("GET", "/fapi/v1/exchangeInfo", params=params, signed=False)
+        # every snapshot refreshes the per-symbol filter cache used for order validation
+        now = time.monotonic()
+        for s in info.get("symbols", []):
+            self._symbol_info[s.get("symbol")] = (now, s)
+        return info
+
+    def get_book_ticker(self, symbol):
+        return self._request("GET", "/fapi/v1/ticker/bookTicker", params={"symbol": symbol.upper()}, signed=False)
+
+    def get_agg_trades(self, symbol, from_id=None, limit=500):
+        params = {"symbol": symbol.upper(), "limit": limit}
+        if from_id is not None:
+            params["fromId"] = from_id
+        return self._request("GET", "/fapi/v1/aggTrades", params=params, signed=False)
+
+    def get_mark_price(self, symbol):
+        return float(self._request("GET", "/fapi/v1/premiumIndex", params={"symbol": symbol.upper()}, signed=False)["markPrice"])
 
     def get_symbol_filters(self, symbol):
-        info = self.get_exchange_info(symbol)
         symbol = symbol.upper()
-        for s in info.get("symbols", []):
-            if s.get("symbol") == symbol:
-                return s
-        raise BinanceClientError(f"Symbol {symbol} not found")
-
+        cached = self._symbol_info.get(symbol)
+        if cached is None or time.monotonic() - cached[0] >= SYMBOL_INFO_TTL:
+            self.get_exchange_info(symbol)
+            cached = self._symbol_info.get(symbol)
+        if cached is None:
+            raise BinanceClientError(f"Symbol {symbol} not found")
+        return cached[1]
+
+    @traced("validate")
     def _validate_and_enrich(self, symbol, side, quantity, price=None):
         validate_symbol(symbol)
         validate_side(side)
@@ -94,13 +132,63 @@ class BinanceFuturesClient:
         if price is not None:
             validate_positive("price", price)
 
-        symbol_filters = self.get_symbol_filters(symbol)
+        with span("exchange_info"):
+            symbol_filters = self.get_symbol_filters(symbol)
         filters = symbol_filters.get("filters", [])
         validate_with_filters(symbol, quantity, price, filters)
+        # market orders use a seeded or cached mark; one is fetched only when a notional limit needs it
+        if price is None and not self.risk.has_mark(symbol) and self.risk.needs_mark(symbol):
+            with span("mark_price"):
+                self.risk.update_mark(symbol, self.get_mark_price(symbol))
+        with span("risk_check"):
+            self.risk.check(symbol, side, quantity, price)
 
         return {"symbol_info": symbol_filters}
 
-    def place_market_order(self, symbol, side, quantity, position_side=None, reduce_only=False):
+    def add_order_listener(self, listener):
+        self._order_listeners.append(listener)
+
+    def _on_order(self, order):
+        self.risk.on_order_update(order)
+        for listener in self._order_listeners:
+            listener(order)
+
+    def _submit_order(self, params):
+        order = Order.from_dict(self._request("POST", "/fapi/v1/order", params=params, signed=True))
+        self._on_order(order)
+        return order
+
+    @traced("place_batch_orders")
+    def place_batch_orders(self, orders):
+        params = {"batchOrders": json.dumps(orders, separators=(",", ":"))}
+
+        logger.info(f"Placing batch of {len(orders)} orders")
+        results = []
+        for item in self._request("POST", "/fapi/v1/batchOrders", params=params, signed=True):
+            if "orderId" in item:
+                order = Order.from_dict(item)
+                self._on_order(order)
+                results.append(order)
+            else:
+                results.append(BinanceClientError(f"API error {item.get('code')}: {item.get('msg')}"))
+        return results
+
+    @traced("submit_prepared")
+    def submit_prepared(self, prepared, stats=None):
+        start = time.perf_counter()
+        self.risk.check(prepared.symbol, prepared.side, prepared.quantity, prepared.price)
+        with span("sign"):
+            query = self._sign_query(prepared.query)
+        if stats is not None:
+            stats.record(time.perf_counter() - start)
+
+        logger.info(f"Placing prepared {prepared.order_type} order")
+        order = Order.from_dict(self._send("POST", "/fapi/v1/order", query, self._headers()))
+        self._on_order(order)
+        return order
+
+    @traced("place_market_order")
+    def place_market_order(self, symbol, side, quantity, position_side=None, reduce_only=False, client_order_id=None):
         self._validate_and_enrich(symbol, side, quantity, None)
 
         params = {
@@ -111,11 +199,14 @@ class BinanceFuturesClient:
             "reduceOnly": "true" if reduce_only else "false",
         }
         params["positionSide"] = position_side or DEFAULT_POSITION_SIDE
+        if client_order_id:
+            params["newClientOrderId"] = client_order_id
 
         logger.info("Placing MARKET order")
-        return self._request("POST", "/fapi/v1/order", params=params, signed=True)
+        return self._submit_order(params)
 
-    def place_limit_order(self, symbol, side, quantity, price, time_in_force="GTC", position_side=None, reduce_only=False):
+    @traced("place_limit_order")
+    def place_limit_order(self, symbol, side, quantity, price, time_in_force="GTC", position_side=None, reduce_only=False, client_order_id=None):
         self._validate_and_enrich(symbol, side, quantity, price)
 
         params = {
@@ -128,11 +219,14 @@ class BinanceFuturesClient:
             "reduceOnly": "true" if reduce_only else "false",
         }
         params["positionSide"] = position_side or DEFAULT_POSITION_SIDE
+        if client_order_id:
+            params["newClientOrderId"] = client_order_id
 
         logger.info("Placing LIMIT order")
-        return self._request("POST", "/fapi/v1/order", params=params, signed=True)
+        return self._submit_order(params)
 
-    def place_stop_limit_order(self, symbol, side, quantity, stop_price, limit_price, time_in_force="GTC", position_side=None, reduce_only=False):
+    @traced("place_stop_limit_order")
+    def place_stop_limit_order(self, symbol, side, quantity, stop_price, limit_price, time_in_force="GTC", position_side=None, reduce_only=False, client_order_id=None):
         self._validate_and_enrich(symbol, side, quantity, limit_price)
 
         params = {
@@ -146,10 +240,33 @@ class BinanceFuturesClient:
             "reduceOnly": "true" if reduce_only else "false",
         }
         params["positionSide"] = position_side or DEFAULT_POSITION_SIDE
+        if client_order_id:
+            params["newClientOrderId"] = client_order_id
 
         logger.info("Placing STOP-LIMIT order")
-        return self._request("POST", "/fapi/v1/order", params=params, signed=True)
+        return self._submit_order(params)
+
+    @traced("place_stop_market_order")
+    def place_stop_market_order(self, symbol, side, quantity, stop_price, position_side=None, reduce_only=False, client_order_id=None):
+        self._validate_and_enrich(symbol, side, quantity, None)
+        validate_positive("stop_price", stop_price)
 
+        params = {
+            "symbol": symbol.upper(),
+            "side": side.upper(),
+            "type": "STOP_MARKET",
+            "quantity": quantity,
+            "stopPrice": stop_price,
+            "reduceOnly": "true" if reduce_only else "false",
+        }
+        params["positionSide"] = position_side or DEFAULT_POSITION_SIDE
+        if client_order_id:
+            params["newClientOrderId"] = client_order_id
+
+        logger.info("Placing STOP-MARKET order")
+        return self._submit_order(params)
+
+    @traced("cancel_order")
     def cancel_order(self, symbol, order_id=None, client_order_id=None):
         params = {"symbol": symbol.upper()}
         if order_id is not None:
@@ -160,8 +277,11 @@ class BinanceFuturesClient:
             raise BinanceClientError("order_id or client_order_id must be provided")
 
         logger.info("Cancelling order")
-        return self._request("DELETE", "/fapi/v1/order", params=params, signed=True)
+        order = Order.from_dict(self._request("DELETE", "/fapi/v1/order", params=params, signed=True))
+        self._on_order(order)
+        return order
 
+    @traced("get_order")
     def get_order(self, symbol, order_id=None, client_order_id=None):
         params = {"symbol": symbol.upper()}
         if order_id is not None:
@@ -172,4 +292,48 @@ class BinanceFuturesClient:
             raise BinanceClientError("order_id or client_order_id must be provided")
 
         logger.info("Query order")
-        return self._request("GET", "/fapi/v1/order", params=params, signed=True)
+        order = Order.from_dict(self._request("GET", "/fapi/v1/order", params=params, signed=True))
+        self._on_order(order)
+        return order
+
+    @traced("get_open_orders")
+    def get_open_orders(self, symbol=None):
+        params = {}
+        if symbol:
+            params["symbol"] = symbol.upper()
+        return [Order.from_dict(o) for o in self._request("GET", "/fapi/v1/openOrders", params=params, signed=True)]
+
+    def get_user_trades(self, symbol, from_id=None, limit=1000):
+        params = {"symbol": symbol.upper(), "limit": limit}
+        if from_id is not None:
+            params["fromId"] = from_id
+        return self._request("GET", "/fapi/v1/userTrades", params=params, signed=True)
+
+    def get_all_orders(self, symbol, order_id=None, limit=1000):
+        params = {"symbol": symbol.upper(), "limit": limit}
+        if order_id is not None:
+            params["orderId"] = order_id
+        return [Order.from_dict(o) for o in self._request("GET", "/fapi/v1/allOrders", params=params, signed=True)]
+
+    def get_income(self, start_time=None, income_type=None, limit=1000):
+        params = {"limit": limit}
+        if start_time is not None:
+            params["startTime"] = start_time
+        if income_type:
+            params["incomeType"] = income_type
+        return self._request("GET", "/fapi/v1/income", params=params, signed=True)
+
+    def get_position_risk(self, symbol=None):
+        params = {}
+        if symbol:
+            params["symbol"] = symbol.upper()
+        return self._request("GET", "/fapi/v2/positionRisk", params=params, signed=True)
+
+    def get_balances(self):
+        return self._request("GET", "/fapi/v2/balance", signed=True)
+
+    def create_listen_key(self):
+        return self._request("POST", "/fapi/v1/listenKey", keyed=True)["listenKey"]
+
+    def keepalive_listen_key(self):
+        return self._request("PUT", "/fapi/v1/listenKey", keyed=True)
@@ -0,0 +1,265 @@
+import argparse
+import csv
+import json
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from decimal import InvalidOperation
+
+from src.binance_client import BinanceFuturesClient, BinanceClientError
+from src.config import DEFAULT_POSITION_SIDE
+from src.models import loads, new_client_order_id
+from src.rate_limit import RateLimiter
+from src.tracing import traced
+from src.validator import ValidationError, validate_symbol, validate_side, validate_positive, validate_with_filters
+from src.logger_utils import get_logger
+
+logger = get_logger("bulk_orders")
+
+BATCH_LIMIT = 5
+PRICED_TYPES = ("LIMIT", "STOP", "TAKE_PROFIT")
+STOP_TYPES = ("STOP", "STOP_MARKET", "TAKE_PROFIT", "TAKE_PROFIT_MARKET")
+ORDER_TYPES = ("MARKET",) + PRICED_TYPES + ("STOP_MARKET", "TAKE_PROFIT_MARKET")
+
+
+def _text(value):
+    if value is None:
+        return ""
+    return value.strip() if isinstance(value, str) else str(value)
+
+
+def read_orders(stream, fmt):
+    if fmt == "csv":
+        for line_no, row in enumerate(csv.DictReader(stream), 2):
+            yield line_no, row, None
+        return
+    for line_no, line in enumerate(stream, 1):
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        try:
+            row = loads(line)
+        except ValueError as exc:
+            yield line_no, None, ValidationError(f"Invalid JSON: {exc}")
+            continue
+        if isinstance(row, dict):
+            yield line_no, row, None
+        else:
+            yield line_no, None, ValidationError(f"Expected a JSON object, got {type(row).__name__}")
+
+
+def build_order_params(row, rules):
+    symbol = _text(row.get("symbol")).upper()
+    side = _text(row.get("side")).upper()
+    quantity = _text(row.get("quantity"))
+    price = _text(row.get("price")) or None
+    stop_price = _text(row.get("stop_price")) or None
+    order_type = (_text(row.get("type")) or ("LIMIT" if price else "MARKET")).upper()
+
+    validate_symbol(symbol)
+    validate_side(side)
+    if order_type not in ORDER_TYPES:
+        raise ValidationError(f"Unsupported order type {order_type}")
+    if order_type in PRICED_TYPES and price is None:
+        raise ValidationError(f"price is required for {order_type}")
+    if order_type in STOP_TYPES and stop_price is None:
+        raise ValidationError(f"stop_price is required for {order_type}")
+    filters = rules.get(symbol)
+    if filters is None:
+        raise ValidationError(f"Symbol {symbol} not found")
+    try:
+        validate_positive("quantity", quantity)
+        if price is not None:
+            validate_positive("price", price)
+        if stop_price is not None:
+            validate_positive("stop_price", stop_price)
+        validate_with_filters(symbol, quantity, price if order_type in PRICED_TYPES else None, filters)
+    except InvalidOperation:
+        raise ValidationError(f"Invalid number in {row}")
+
+    params = {"symbol": symbol, "side": side, "type": order_type, "quantity": quantity}
+    if order_type in PRICED_TYPES:
+        params["price"] = price
+        params["timeInForce"] = _text(row.get("time_in_force")).upper() or "GTC"
+    if stop_price is not None:
+        params["stopPrice"] = stop_price
+    params["reduceOnly"] = "true" if _text(row.get("reduce_only")).lower() in ("true", "1", "yes") else "false"
+    params["positionSide"] = _text(row.get("position_side")).upper() or DEFAULT_POSITION_SIDE
+    params["newClientOrderId"] = _text(row.get("client_order_id")) or new_client_order_id("bulk")
+    return params
+
+
+class BulkProgress:
+    def __init__(self, stream=sys.stderr, every=1.0):
+        self.stream = stream
+        self.every = every
+        self.read = 0
+        self.ok = 0
+        self.failed = 0
+        self.started = time.perf_counter()
+        self._printed = self.started
+        self._lock = threading.Lock()
+
+    def update(self, ok=0, failed=0):
+        with self._lock:
+            self.ok += ok
+            self.failed += failed
+            now = time.perf_counter()
+            if now - self._printed >= self.every:
+                self._printed = now
+                self._print(now, end="\r")
+
+    def _print(self, now, end):
+        done = self.ok + self.failed
+        rate = done / (now - self.started) if now > self.started else 0.0
+        print(f"read {self.read}  ok {self.ok}  errors {self.failed}  {rate:.1f} orders/s", file=self.stream, end=end, flush=True)
+
+    def finish(self):
+        with self._lock:
+            self._print(time.perf_counter(), end="\n")
+
+
+class BulkOrderSubmitter:
+    def __init__(self, client=None, workers=4, batch_size=BATCH_LIMIT, rate=3.0):
+        self.client = client or BinanceFuturesClient()
+        if not 1 <= batch_size <= BATCH_LIMIT:
+            raise ValidationError(f"batch_size must be between 1 and {BATCH_LIMIT}, got {batch_size}")
+        validate_positive("rate", rate)
+        self.workers = workers
+        self.batch_size = batch_size
+        # the limiter counts orders with a one-batch burst; burst plus one second of refill
+        # must fit the risk engine's sliding orders-per-second window
+        order_rate = rate * batch_size
+        max_per_second = self.client.risk.limits.max_orders_per_second
+        if max_per_second > batch_size:
+            order_rate = min(order_rate, max_per_second - batch_size)
+        self.limiter = RateLimiter(order_rate, burst=batch_size)
+        self._out = None
+        self._out_lock = threading.Lock()
+        self.progress = None
+
+    def _load_rules(self):
+        info = self.client.get_exchange_info()
+        return {s["symbol"]: s.get("filters", []) for s in info.get("symbols", [])}
+
+    def _write(self, record):
+        line = json.dumps(record, separators=(",", ":"))
+        with self._out_lock:
+            self._out.write(line + "\n")
+
+    def _fail(self, line_no, error):
+        if not isinstance(error, (ValidationError, BinanceClientError)):
+            logger.error(f"Unexpected error on line {line_no}: {error!r}")
+        self._write({"line": line_no, "status": "error", "error": str(error)})
+        self.progress.update(failed=1)
+
+    @traced("BulkOrderSubmitter.batch")
+    def _submit(self, batch, slots):
+        reported = set()
+
+        def fail(line_no, error):
+            reported.add(line_no)
+            self._fail(line_no, error)
+
+        try:
+            self.limiter.acquire(len(batch))
+            accepted = []
+            for line_no, params in batch:
+                try:
+                    price = params.get("price")
+                    if price is None and not self.client.risk.has_mark(params["symbol"]):
+                        self.client.risk.update_mark(params["symbol"], self.client.get_mark_price(params["symbol"]))
+                    self.client.risk.check(params["symbol"], params["side"], params["quantity"], price)
+                    accepted.append((line_no, params))
+                except Exception as exc:
+                    fail(line_no, exc)
+            if not accepted:
+                return
+            try:
+                results = self.client.place_batch_orders([params for _, params in accepted])
+            except Exception as exc:
+                results = [exc] * len(accepted)
+            for (line_no, _), result in zip(accepted, results):
+                if isinstance(result, Exception):
+                    fail(line_no, result)
+                else:
+                    reported.add(line_no)
+                    self._write({"line": line_no, "status": "ok", "symbol": result.symbol, "order_id": result.order_id, "order_status": result.status})
+                    self.progress.update(ok=1)
+        except Exception as exc:
+            # the pool would otherwise keep the exception in a future nobody reads
+            for line_no, _ in batch:
+                if line_no not in reported:
+                    fail(line_no, exc)
+        finally:
+            slots.release()
+
+    def run(self, stream, fmt, out):
+        rules = self._load_rules()
+        self._out = out
+        self.progress = BulkProgress()
+        # bounds read-ahead so memory stays constant regardless of input size
+        slots = threading.BoundedSemaphore(self.workers * 2)
+        batch = []
+
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="bulk") as pool:
+            for line_no, row, error in read_orders(stream, fmt):
+                self.progress.read += 1
+                if error is None:
+                    try:
+                        batch.append((line_no, build_order_params(row, rules)))
+                    except ValidationError as exc:
+                        error = exc
+                if error is not None:
+                    self._fail(line_no, error)
+                if len(batch) == self.batch_size:
+                    slots.acquire()
+                    pool.submit(self._submit, batch, slots)
+                    batch = []
+            if batch:
+                slots.acquire()
+                pool.submit(self._submit, batch, slots)
+
+        self.progress.finish()
+        return self.progress
+
+
+def _detect_format(path, fmt):
+    if fmt:
+        return fmt
+    return "csv" if path.lower().endswith(".csv") else "jsonl"
+
+
+def run_bulk(input_path, output_path, fmt=None, workers=4, batch_size=BATCH_LIMIT, rate=3.0, client=None):
+    fmt = _detect_format(input_path, fmt)
+    submitter = BulkOrderSubmitter(client=client, workers=workers, batch_size=batch_size, rate=rate)
+    source = sys.stdin if input_path == "-" else open(input_path, newline="")
+    try:
+        with open(output_path, "w") as out:
+            return submitter.run(source, fmt, out)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Submit orders in bulk from CSV or JSONL")
+    parser.add_argument("input", help="CSV/JSONL file, or - for stdin")
+    parser.add_argument("--output", default="bulk_results.jsonl", help="JSONL file for per-order results")
+    parser.add_argument("--format", choices=["csv", "jsonl"], help="Input format (default: from extension)")
+    parser.add_argument("--workers", type=int, default=4, help="Concurrent batch requests")
+    parser.add_argument("--batch-size", type=int, default=BATCH_LIMIT, choices=range(1, BATCH_LIMIT + 1), help="Orders per batch request (1-5)")
+    parser.add_argument("--rate", type=float, default=3.0, help="Batch requests per second")
+    args = parser.parse_args()
+
+    try:
+        progress = run_bulk(args.input, args.output, args.format, args.workers, args.batch_size, args.rate)
+        print(f"Bulk complete: {progress.ok} placed, {progress.failed} failed")
+    except (ValidationError, BinanceClientError) as exc:
+        logger.error(f"Bulk submission failed: {str(exc)}")
+        print(f"Error: {exc}")
+
+
+if __name__ == "__main__":
+    main()
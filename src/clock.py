@@ -0,0 +1,41 @@
+import threading
+import time
+
+_speed = 1.0
+_origin = (0.0, 0.0)
+_skipped = 0.0
+_lock = threading.Lock()
+
+
+def set_speed(speed):
+    # strategies read time and sleep through here so a replay can run their
+    # schedules faster; 0 skips sleeps and advances the clock by the skipped time
+    global _speed, _origin, _skipped
+    with _lock:
+        _speed = speed
+        _origin = (time.time(), time.monotonic())
+        _skipped = 0.0
+
+
+def speed():
+    return _speed
+
+
+def now():
+    if _speed == 1.0:
+        return time.time()
+    if _speed > 0:
+        wall, mono = _origin
+        return wall + (time.monotonic() - mono) * _speed
+    return time.time() + _skipped
+
+
+def sleep(seconds):
+    global _skipped
+    if seconds <= 0:
+        return
+    if _speed > 0:
+        time.sleep(seconds / _speed)
+        return
+    with _lock:
+        _skipped += seconds
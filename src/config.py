@@ -5,7 +5,29 @@ USE_TESTNET = True
 BINANCE_API_KEY = "test_api_key"
 BINANCE_API_SECRET = "test_api_secret"
 BASE_URL = "https://demo-fapi.binance.com" if USE_TESTNET else "https://fapi.binance.com"
+WS_BASE_URL = "wss://fstream.binancefuture.com" if USE_TESTNET else "wss://fstream.binance.com"
 
 RECV_WINDOW = int(os.environ.get("BINANCE_RECV_WINDOW", "5000"))
 
 DEFAULT_POSITION_SIDE = os.environ.get("BINANCE_POSITION_SIDE", "BOTH")  # BOTH/LONG/SHORT
+
+RISK_MAX_ORDER_QTY = float(os.environ.get("BINANCE_RISK_MAX_ORDER_QTY", "0"))
+RISK_MAX_ORDER_NOTIONAL = float(os.environ.get("BINANCE_RISK_MAX_ORDER_NOTIONAL", "50000"))
+RISK_MAX_POSITION_NOTIONAL = float(os.environ.get("BINANCE_RISK_MAX_POSITION_NOTIONAL", "250000"))
+RISK_MAX_GROSS_NOTIONAL = float(os.environ.get("BINANCE_RISK_MAX_GROSS_NOTIONAL", "1000000"))
+RISK_MAX_ORDERS_PER_SECOND = int(os.environ.get("BINANCE_RISK_MAX_ORDERS_PER_SECOND", "20"))
+RISK_MAX_OPEN_ORDERS = int(os.environ.get("BINANCE_RISK_MAX_OPEN_ORDERS", "200"))
+RISK_MAX_TOTAL_OPEN_ORDERS = int(os.environ.get("BINANCE_RISK_MAX_TOTAL_OPEN_ORDERS", "1000"))
+
+SYMBOL_INFO_TTL = float(os.environ.get("BINANCE_SYMBOL_INFO_TTL", "300"))
+ACCOUNT_POLL_INTERVAL = float(os.environ.get("BINANCE_ACCOUNT_POLL_INTERVAL", "30"))
+LISTEN_KEY_KEEPALIVE = float(os.environ.get("BINANCE_LISTEN_KEY_KEEPALIVE", "1800"))
+
+GRID_ORDER_RATE = float(os.environ.get("BINANCE_GRID_ORDER_RATE", "10"))
+GRID_WORKERS = int(os.environ.get("BINANCE_GRID_WORKERS", "8"))
+GRID_RETRY_BACKOFF = float(os.environ.get("BINANCE_GRID_RETRY_BACKOFF", "30"))
+GRID_MAX_RETRIES = int(os.environ.get("BINANCE_GRID_MAX_RETRIES", "5"))
+
+TRIGGER_MAX_ATTEMPTS = int(os.environ.get("BINANCE_TRIGGER_MAX_ATTEMPTS", "3"))
+
+HISTORY_DB_PATH = os.environ.get("BINANCE_HISTORY_DB", "trade_history.db")
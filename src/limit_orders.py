@@ -1,5 +1,6 @@
 import argparse
 from src.binance_client import BinanceFuturesClient, BinanceClientError
+from src.tracing import traced
 from src.validator import ValidationError
 from src.logger_utils import get_logger
 
@@ -7,9 +8,11 @@ logger = get_logger("limit_orders")
 
 
 class LimitOrder:
-    def __init__(self, client=None):
+    def __init__(self, client=None, account=None):
         self.client = client or BinanceFuturesClient()
+        self.account = account
 
+    @traced("LimitOrder.place_order")
     def place_order(self, symbol, side, quantity, price, time_in_force="GTC", reduce_only=False):
         symbol = symbol.upper().strip()
         side = side.upper().strip()
@@ -17,6 +20,8 @@ class LimitOrder:
         logger.info(f"Placing limit order: {side} {quantity} {symbol} @ {price}")
 
         try:
+            if reduce_only and self.account is not None:
+                self.account.check_reduce_only(symbol, side, quantity)
             response = self.client.place_limit_order(
                 symbol=symbol,
                 side=side,
@@ -25,7 +30,7 @@ class LimitOrder:
                 time_in_force=time_in_force,
                 reduce_only=reduce_only,
             )
-            logger.info(f"Order placed: {response.get('orderId')}")
+            logger.info(f"Order placed: {response.order_id}")
             return response
         except Exception as e:
             logger.error(f"Failed to place limit order: {str(e)}")
@@ -1,31 +1,40 @@
 import argparse
 import sys
+import time
 from src.binance_client import BinanceFuturesClient
+from src.account_state import AccountStateCache
+from src.transport import RequestsTransport, RecordingTransport, ReplayTransport, set_default_transport
+from src import clock, tracing
 from src.market_orders import MarketOrder
 from src.limit_orders import LimitOrder
 from src.advanced.stop_limit import StopLimitOrder
 from src.advanced.oco import OCOOrder
 from src.advanced.twap import TWAPOrder
 from src.advanced.grid_strategy import GridStrategy
+from src.advanced.grid_orchestrator import run_orchestrator
+from src.bulk_orders import run_bulk, BATCH_LIMIT
+from src.trade_history import TradeHistory, HistorySync, print_report
+from src.open_orders import OpenOrderIndex, print_summary
+from src.config import GRID_WORKERS, GRID_ORDER_RATE, HISTORY_DB_PATH
 from src.logger_utils import get_logger
 
 logger = get_logger("main")
 
 
 def market_order_command(args):
-    handler = MarketOrder()
+    handler = MarketOrder(args.client, account=args.account)
     response = handler.place_order(args.symbol, args.side, args.quantity, args.reduce_only)
     print_order_response(response, "Market Order")
 
 
 def limit_order_command(args):
-    handler = LimitOrder()
+    handler = LimitOrder(args.client, account=args.account)
     response = handler.place_order(args.symbol, args.side, args.quantity, args.price, args.time_in_force, args.reduce_only)
     print_order_response(response, "Limit Order")
 
 
 def stop_limit_command(args):
-    handler = StopLimitOrder()
+    handler = StopLimitOrder(args.client, account=args.account)
     response = handler.place_order(args.symbol, args.side, args.quantity, args.stop_price, args.limit_price, args.time_in_force, args.reduce_only)
     print_order_response(response, "Stop-Limit Order")
 
@@ -41,23 +50,29 @@ def oco_command(args):
     print(f"Orders: {len(response.get('orders', []))}")
     for i, order in enumerate(response.get("orders", []), 1):
         print(f"Order {i}:")
-        print(f"  Order ID: {order.get('orderId')}")
-        print(f"  Type: {order.get('type')}")
-        print(f"  Price: {order.get('price')}")
-        if order.get("stopPrice"):
-            print(f"  Stop Price: {order.get('stopPrice')}")
+        print(f"  Order ID: {order.order_id}")
+        print(f"  Type: {order.type}")
+        print(f"  Price: {order.price}")
+        if order.stop_price:
+            print(f"  Stop Price: {order.stop_price}")
 
 
 def twap_command(args):
     handler = TWAPOrder()
-    orders = handler.execute_twap(args.symbol, args.side, args.total_quantity, args.duration_minutes, args.num_slices)
+    orders = handler.execute_twap(args.symbol, args.side, args.total_quantity, args.duration_minutes, args.num_slices, args.mode, args.participation)
     print(f"TWAP Execution Completed")
     print(f"Total slices: {len(orders)}")
-    total_executed = sum(float(o.get("executedQty", 0)) for o in orders)
+    total_executed = sum(o.executed_qty for o in orders)
     print(f"Total quantity: {total_executed}")
     if total_executed > 0:
-        avg_price = sum(float(o.get("avgPrice", 0)) * float(o.get("executedQty", 0)) for o in orders if o.get("executedQty", 0) > 0) / total_executed
+        avg_price = sum(o.avg_price * o.executed_qty for o in orders) / total_executed
         print(f"Average price: {avg_price:.2f}")
+    if handler.fire_stats:
+        print(f"Fire latency: p50 {handler.fire_stats['p50_us']:.1f} us, max {handler.fire_stats['max_us']:.1f} us")
+    if handler.report:
+        print(f"Arrival price: {handler.report['arrival_price']:.2f}")
+        print(f"Unfilled quantity: {handler.report['unfilled_quantity']}")
+        print(f"Implementation shortfall: {handler.report['shortfall_bps']:.2f} bps ({handler.report['shortfall_cost']:.4f})")
 
 
 def grid_command(args):
@@ -66,8 +81,8 @@ def grid_command(args):
         orders = handler.create_grid(args.symbol, args.lower_price, args.upper_price, args.num_grids, args.quantity_per_grid, args.side)
         print(f"Grid Created")
         print(f"Total orders: {len(orders)}")
-        buy_count = sum(1 for o in orders if o.get("side") == "BUY")
-        sell_count = sum(1 for o in orders if o.get("side") == "SELL")
+        buy_count = sum(1 for o in orders if o.side == "BUY")
+        sell_count = sum(1 for o in orders if o.side == "SELL")
         print(f"BUY orders: {buy_count}")
         print(f"SELL orders: {sell_count}")
     elif args.action == "status":
@@ -77,28 +92,137 @@ def grid_command(args):
         print(f"Total open orders: {status['total_open_orders']}")
         print(f"BUY orders: {status['buy_orders']}")
         print(f"SELL orders: {status['sell_orders']}")
+    elif args.action == "run":
+        run_orchestrator(args.config, args.interval, args.cycles, args.workers, args.order_rate)
+
+
+def bulk_command(args):
+    progress = run_bulk(args.input, args.output, args.format, args.workers, args.batch_size, args.rate)
+    print(f"Bulk Submission Complete")
+    print(f"Orders read: {progress.read}")
+    print(f"Placed: {progress.ok}")
+    print(f"Failed: {progress.failed}")
+    print(f"Results: {args.output}")
+
+
+def history_command(args):
+    history = TradeHistory(args.db)
+    try:
+        if args.action == "sync":
+            result = HistorySync(history).sync(args.symbols)
+            print(f"History Synced")
+            print(f"Symbols: {result['symbols']}")
+            print(f"New trades: {result['trades']}")
+            print(f"Orders updated: {result['orders']}")
+            print(f"New income rows: {result['income']}")
+        elif args.action == "report":
+            if args.sync:
+                HistorySync(history).sync()
+            since = int((time.time() - args.days * 86400) * 1000) if args.days else 0
+            print_report(history.report(since, args.symbol, args.strategy))
+    finally:
+        history.close()
+
+
+def status_command(args):
+    index = OpenOrderIndex()
+    try:
+        if args.watch:
+            index.subscribe()
+        index.seed()
+        while True:
+            rows = index.summary(args.strategy)
+            if args.symbol:
+                rows = [r for r in rows if r["symbol"] == args.symbol.upper()]
+            print_summary(rows)
+            if not args.watch:
+                break
+            time.sleep(args.watch)
+            print()
+    finally:
+        index.close()
 
 
 def print_order_response(response, order_type):
     print(f"{order_type} Placed")
-    print(f"Order ID: {response.get('orderId')}")
-    print(f"Symbol: {response.get('symbol')}")
-    print(f"Side: {response.get('side')}")
-    print(f"Type: {response.get('type')}")
-    print(f"Quantity: {response.get('origQty')}")
-    if response.get("price"):
-        print(f"Price: {response.get('price')}")
-    if response.get("stopPrice"):
-        print(f"Stop Price: {response.get('stopPrice')}")
-    print(f"Status: {response.get('status')}")
-    if response.get("executedQty"):
-        print(f"Executed Quantity: {response.get('executedQty')}")
-    if response.get("avgPrice"):
-        print(f"Average Price: {response.get('avgPrice')}")
+    print(f"Order ID: {response.order_id}")
+    print(f"Symbol: {response.symbol}")
+    print(f"Side: {response.side}")
+    print(f"Type: {response.type}")
+    print(f"Quantity: {response.orig_qty}")
+    if response.price:
+        print(f"Price: {response.price}")
+    if response.stop_price:
+        print(f"Stop Price: {response.stop_price}")
+    print(f"Status: {response.status}")
+    if response.executed_qty:
+        print(f"Executed Quantity: {response.executed_qty}")
+    if response.avg_price:
+        print(f"Average Price: {response.avg_price}")
+
+
+def configure_transport(args):
+    if args.replay:
+        transport = ReplayTransport(args.replay, speed=args.replay_speed)
+        clock.set_speed(args.replay_speed)
+    elif args.record:
+        transport = RecordingTransport(RequestsTransport(), args.record)
+    else:
+        return None
+    set_default_transport(transport)
+    return transport
+
+
+def seeds_account(args):
+    # long-running commands amortize the snapshot; single orders skip it and fetch a mark only if needed
+    if args.command == "grid":
+        return args.action in ("create", "run")
+    return args.command in ("twap", "bulk")
+
+
+def seed_account(client):
+    # positions, marks and open orders from before this run, so risk limits see the whole account
+    account = AccountStateCache(client).seed()
+    client.risk.seed_from_account(account, client.get_open_orders())
+    return account
+
+
+def configure_tracing(args):
+    folded = args.profile is not None and args.profile.endswith(".folded")
+    if args.trace or folded:
+        tracing.enable()
+    if args.profile and not folded:
+        return tracing.Profiler(args.profile).start()
+    return None
+
+
+def finish_tracing(args, profiler):
+    if profiler is not None:
+        profiler.stop()
+        print(f"Profile written to {args.profile}", file=sys.stderr)
+    elif args.profile:
+        tracing.write_folded(args.profile)
+        print(f"Folded stacks written to {args.profile}", file=sys.stderr)
+    if args.trace:
+        tracing.print_summary()
+
+
+def print_run_summary(transport, wall_start, cpu_start):
+    wall = time.perf_counter() - wall_start
+    cpu = time.process_time() - cpu_start
+    print(f"Requests: {transport.requests}", file=sys.stderr)
+    print(f"Network latency: {transport.latency * 1000:.1f} ms", file=sys.stderr)
+    print(f"CPU time: {cpu * 1000:.1f} ms", file=sys.stderr)
+    print(f"Wall time: {wall * 1000:.1f} ms", file=sys.stderr)
 
 
 def main():
     parser = argparse.ArgumentParser(description="Binance Futures Trading Bot")
+    parser.add_argument("--record", metavar="FILE", help="Record HTTP traffic and timings to FILE")
+    parser.add_argument("--replay", metavar="FILE", help="Serve HTTP responses from a recording instead of the network")
+    parser.add_argument("--replay-speed", type=float, default=1.0, help="Replay speed-up factor for latency and strategy sleeps (0 = no delay)")
+    parser.add_argument("--trace", action="store_true", help="Print per-stage span timings to stderr")
+    parser.add_argument("--profile", metavar="FILE", help="Write a cProfile .prof to FILE (or span stacks if FILE ends in .folded)")
     subparsers = parser.add_subparsers(dest="command", help="Order type")
 
     market_parser = subparsers.add_parser("market", help="Place a market order")
@@ -138,6 +262,8 @@ def main():
     twap_parser.add_argument("total_quantity", type=float, help="Total quantity to execute")
     twap_parser.add_argument("duration_minutes", type=int, help="Duration in minutes")
     twap_parser.add_argument("--num-slices", type=int, default=10, help="Number of slices")
+    twap_parser.add_argument("--mode", default="TWAP", choices=["TWAP", "ADAPTIVE"], help="Even slices or volume-participation execution")
+    twap_parser.add_argument("--participation", type=float, default=0.1, help="Target share of market volume in ADAPTIVE mode")
 
     grid_parser = subparsers.add_parser("grid", help="Grid trading strategy")
     grid_subparsers = grid_parser.add_subparsers(dest="action", help="Grid action")
@@ -153,18 +279,59 @@ def main():
     grid_status_parser = grid_subparsers.add_parser("status", help="Check grid status")
     grid_status_parser.add_argument("symbol", help="Trading pair symbol")
 
+    grid_run_parser = grid_subparsers.add_parser("run", help="Run many grids from a config file")
+    grid_run_parser.add_argument("config", help="JSON file with symbol/range/levels/quantity specs")
+    grid_run_parser.add_argument("--interval", type=float, default=30.0, help="Seconds between maintenance cycles")
+    grid_run_parser.add_argument("--cycles", type=int, default=0, help="Maintenance cycles to run (0 = forever)")
+    grid_run_parser.add_argument("--workers", type=int, default=GRID_WORKERS, help="Worker threads")
+    grid_run_parser.add_argument("--order-rate", type=float, default=GRID_ORDER_RATE, help="Shared requests per second")
+
+    history_parser = subparsers.add_parser("history", help="Local fill/income history")
+    history_parser.add_argument("--db", default=HISTORY_DB_PATH, help="SQLite database path")
+    history_subparsers = history_parser.add_subparsers(dest="action", help="History action")
+
+    history_sync_parser = history_subparsers.add_parser("sync", help="Pull new trades, orders and income since the last sync")
+    history_sync_parser.add_argument("--symbols", nargs="*", default=[], help="Extra symbols to sync trades for")
+
+    history_report_parser = history_subparsers.add_parser("report", help="Realized PnL, fees and funding per strategy and symbol")
+    history_report_parser.add_argument("--days", type=float, default=0, help="Only the last N days (0 = all)")
+    history_report_parser.add_argument("--symbol", help="Single symbol")
+    history_report_parser.add_argument("--strategy", help="Single strategy tag (twap, grid, oco, trigger, bulk, manual)")
+    history_report_parser.add_argument("--sync", action="store_true", help="Run an incremental sync first")
+
+    status_parser = subparsers.add_parser("status", help="Open orders across all symbols")
+    status_parser.add_argument("--symbol", help="Only this symbol")
+    status_parser.add_argument("--strategy", help="Only this strategy tag (twap, grid, oco, trigger, bulk, manual)")
+    status_parser.add_argument("--watch", type=float, default=0, help="Keep the index live from order events and reprint every N seconds")
+
+    bulk_parser = subparsers.add_parser("bulk", help="Submit orders in bulk from CSV/JSONL")
+    bulk_parser.add_argument("input", help="CSV/JSONL file, or - for stdin")
+    bulk_parser.add_argument("--output", default="bulk_results.jsonl", help="JSONL file for per-order results")
+    bulk_parser.add_argument("--format", choices=["csv", "jsonl"], help="Input format (default: from extension)")
+    bulk_parser.add_argument("--workers", type=int, default=4, help="Concurrent batch requests")
+    bulk_parser.add_argument("--batch-size", type=int, default=BATCH_LIMIT, choices=range(1, BATCH_LIMIT + 1), help="Orders per batch request (1-5)")
+    bulk_parser.add_argument("--rate", type=float, default=3.0, help="Batch requests per second")
+
     args = parser.parse_args()
 
     if not args.command:
         parser.print_help()
         sys.exit(1)
 
+    transport = configure_transport(args)
+    profiler = configure_tracing(args)
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+
     try:
         client = BinanceFuturesClient()
         if not client.api_key or not client.api_secret:
             print("Error: API credentials not set")
             print("Set BINANCE_API_KEY and BINANCE_API_SECRET environment variables")
             sys.exit(1)
+        # single orders get an empty cache that loads positions only if a reduce-only check needs them
+        args.client = client
+        args.account = seed_account(client) if seeds_account(args) else AccountStateCache(client)
 
         command_handlers = {
             "market": market_order_command,
@@ -173,6 +340,9 @@ def main():
             "oco": oco_command,
             "twap": twap_command,
             "grid": grid_command,
+            "bulk": bulk_command,
+            "history": history_command,
+            "status": status_command,
         }
 
         handler = command_handlers.get(args.command)
@@ -189,6 +359,11 @@ def main():
         print(f"Error: {str(e)}")
         logger.error(f"CLI command failed: {str(e)}")
         sys.exit(1)
+    finally:
+        finish_tracing(args, profiler)
+        if transport is not None:
+            transport.close()
+            print_run_summary(transport, wall_start, cpu_start)
 
 
 if __name__ == "__main__":
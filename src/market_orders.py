@@ -1,5 +1,6 @@
 import sys
 from src.binance_client import BinanceFuturesClient
+from src.tracing import traced
 from src.validator import ValidationError
 from src.logger_utils import get_logger
 
@@ -7,9 +8,11 @@ logger = get_logger("market_orders")
 
 
 class MarketOrder:
-    def __init__(self, client=None):
+    def __init__(self, client=None, account=None):
         self.client = client or BinanceFuturesClient()
+        self.account = account
 
+    @traced("MarketOrder.place_order")
     def place_order(self, symbol, side, quantity, reduce_only=False):
         symbol = symbol.upper().strip()
         side = side.upper().strip()
@@ -17,8 +20,10 @@ class MarketOrder:
         logger.info(f"Placing market order: {side} {quantity} {symbol}")
 
         try:
+            if reduce_only and self.account is not None:
+                self.account.check_reduce_only(symbol, side, quantity)
             response = self.client.place_market_order(symbol=symbol, side=side, quantity=quantity, reduce_only=reduce_only)
-            order_id = response.get("orderId")
+            order_id = response.order_id
             logger.info(f"Order placed: {order_id}")
             return response
         except Exception as e:
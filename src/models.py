@@ -0,0 +1,206 @@
+import uuid
+from collections import OrderedDict
+
+try:
+    import orjson
+
+    def loads(data):
+        return orjson.loads(data)
+except ImportError:
+    import json
+
+    def loads(data):
+        return json.loads(data)
+
+
+STRATEGY_TAGS = ("twap", "grid", "oco", "trigger", "bulk")
+
+
+def new_client_order_id(strategy):
+    # Binance allows up to 36 characters; the prefix attributes fills to a strategy
+    return f"{strategy}-{uuid.uuid4().hex[:24]}"
+
+
+def strategy_of(client_order_id):
+    prefix = (client_order_id or "").split("-", 1)[0]
+    return prefix if prefix in STRATEGY_TAGS else "manual"
+
+
+def _float(value):
+    return float(value) if value not in (None, "") else 0.0
+
+
+class Order:
+    __slots__ = (
+        "order_id",
+        "client_order_id",
+        "symbol",
+        "side",
+        "type",
+        "status",
+        "time_in_force",
+        "position_side",
+        "reduce_only",
+        "price",
+        "stop_price",
+        "avg_price",
+        "orig_qty",
+        "executed_qty",
+        "update_time",
+    )
+
+    def __init__(self, order_id, symbol, side, type, status, price=0.0, orig_qty=0.0, executed_qty=0.0, avg_price=0.0,
+                 stop_price=0.0, client_order_id=None, time_in_force=None, position_side=None, reduce_only=False, update_time=0):
+        self.order_id = order_id
+        self.client_order_id = client_order_id
+        self.symbol = symbol
+        self.side = side
+        self.type = type
+        self.status = status
+        self.time_in_force = time_in_force
+        self.position_side = position_side
+        self.reduce_only = reduce_only
+        self.price = price
+        self.stop_price = stop_price
+        self.avg_price = avg_price
+        self.orig_qty = orig_qty
+        self.executed_qty = executed_qty
+        self.update_time = update_time
+
+    @classmethod
+    def from_dict(cls, d):
+        return cls(
+            order_id=d.get("orderId"),
+            client_order_id=d.get("clientOrderId"),
+            symbol=d.get("symbol"),
+            side=d.get("side"),
+            type=d.get("type"),
+            status=d.get("status"),
+            time_in_force=d.get("timeInForce"),
+            position_side=d.get("positionSide"),
+            reduce_only=d.get("reduceOnly", False),
+            price=_float(d.get("price")),
+            stop_price=_float(d.get("stopPrice")),
+            avg_price=_float(d.get("avgPrice")),
+            orig_qty=_float(d.get("origQty")),
+            executed_qty=_float(d.get("executedQty")),
+            update_time=d.get("updateTime", 0),
+        )
+
+    @classmethod
+    def from_stream(cls, o):
+        # ORDER_TRADE_UPDATE payloads use single-letter keys
+        return cls(
+            order_id=o.get("i"),
+            client_order_id=o.get("c"),
+            symbol=o.get("s"),
+            side=o.get("S"),
+            type=o.get("o"),
+            status=o.get("X"),
+            time_in_force=o.get("f"),
+            position_side=o.get("ps"),
+            reduce_only=o.get("R", False),
+            price=_float(o.get("p")),
+            stop_price=_float(o.get("sp")),
+            avg_price=_float(o.get("ap")),
+            orig_qty=_float(o.get("q")),
+            executed_qty=_float(o.get("z")),
+            update_time=o.get("T", 0),
+        )
+
+    @property
+    def is_terminal(self):
+        return self.status in ("FILLED", "CANCELED", "EXPIRED", "REJECTED")
+
+    @property
+    def strategy(self):
+        return strategy_of(self.client_order_id)
+
+    def __repr__(self):
+        return (f"Order(order_id={self.order_id}, symbol={self.symbol}, side={self.side}, type={self.type}, "
+                f"status={self.status}, price={self.price}, orig_qty={self.orig_qty}, executed_qty={self.executed_qty})")
+
+
+class Fill:
+    __slots__ = (
+        "trade_id",
+        "order_id",
+        "symbol",
+        "side",
+        "position_side",
+        "price",
+        "qty",
+        "quote_qty",
+        "commission",
+        "commission_asset",
+        "realized_pnl",
+        "maker",
+        "time",
+    )
+
+    def __init__(self, trade_id, order_id, symbol, side, price, qty, quote_qty=0.0, commission=0.0, commission_asset=None,
+                 realized_pnl=0.0, maker=False, position_side=None, time=0):
+        self.trade_id = trade_id
+        self.order_id = order_id
+        self.symbol = symbol
+        self.side = side
+        self.position_side = position_side
+        self.price = price
+        self.qty = qty
+        self.quote_qty = quote_qty
+        self.commission = commission
+        self.commission_asset = commission_asset
+        self.realized_pnl = realized_pnl
+        self.maker = maker
+        self.time = time
+
+    @classmethod
+    def from_dict(cls, d):
+        return cls(
+            trade_id=d.get("id"),
+            order_id=d.get("orderId"),
+            symbol=d.get("symbol"),
+            side=d.get("side"),
+            position_side=d.get("positionSide"),
+            price=_float(d.get("price")),
+            qty=_float(d.get("qty")),
+            quote_qty=_float(d.get("quoteQty")),
+            commission=_float(d.get("commission")),
+            commission_asset=d.get("commissionAsset"),
+            realized_pnl=_float(d.get("realizedPnl")),
+            maker=d.get("maker", False),
+            time=d.get("time", 0),
+        )
+
+    def __repr__(self):
+        return f"Fill(trade_id={self.trade_id}, order_id={self.order_id}, symbol={self.symbol}, side={self.side}, price={self.price}, qty={self.qty})"
+
+
+class FillTracker:
+    # executed quantity per live order, so repeated updates count each fill once;
+    # finished ids are remembered (bounded) to ignore late duplicates
+    def __init__(self, keep_finished=10000):
+        self.keep_finished = keep_finished
+        self._executed = {}
+        self._finished = OrderedDict()
+
+    def delta(self, order):
+        order_id = order.order_id
+        if order_id in self._finished:
+            return 0.0
+        delta = order.executed_qty - self._executed.get(order_id, 0.0)
+        if order.is_terminal:
+            self._executed.pop(order_id, None)
+            self._finished[order_id] = None
+            if len(self._finished) > self.keep_finished:
+                self._finished.popitem(last=False)
+        else:
+            self._executed[order_id] = order.executed_qty
+        return delta
+
+    def reset(self, open_orders=()):
+        self._executed = {o.order_id: o.executed_qty for o in open_orders}
+        self._finished.clear()
+
+    def __len__(self):
+        return len(self._executed)
@@ -0,0 +1,191 @@
+import argparse
+import threading
+import time
+
+from src.binance_client import BinanceFuturesClient, BinanceClientError
+from src.models import Order
+from src.logger_utils import get_logger
+
+logger = get_logger("open_orders")
+
+
+class OpenOrderIndex:
+    def __init__(self, client=None):
+        self.client = client or BinanceFuturesClient()
+        self._orders = {}
+        self._by_symbol = {}
+        self._by_side = {}
+        self._by_price = {}
+        self._by_strategy = {}
+        self._lock = threading.Lock()
+        self._stream = None
+        self._pending = None
+        self.updated_at = 0.0
+
+    def _keys(self, order):
+        # side and price are also indexed under symbol None for account-wide queries
+        return (
+            (self._by_symbol, order.symbol),
+            (self._by_side, (order.symbol, order.side)),
+            (self._by_side, (None, order.side)),
+            (self._by_price, (order.symbol, order.price)),
+            (self._by_price, (None, order.price)),
+            (self._by_strategy, order.strategy),
+        )
+
+    def _add(self, order):
+        self._orders[order.order_id] = order
+        for index, key in self._keys(order):
+            index.setdefault(key, set()).add(order.order_id)
+
+    def _remove(self, order_id):
+        order = self._orders.pop(order_id, None)
+        if order is None:
+            return
+        for index, key in self._keys(order):
+            ids = index.get(key)
+            ids.discard(order_id)
+            if not ids:
+                del index[key]
+
+    def seed(self):
+        # one account-wide call instead of one per symbol
+        orders = self.client.get_open_orders()
+        with self._lock:
+            for index in (self._orders, self._by_symbol, self._by_side, self._by_price, self._by_strategy):
+                index.clear()
+            for order in orders:
+                self._add(order)
+            pending, self._pending = self._pending or [], None
+            for order in pending:
+                self._upsert(order)
+            self.updated_at = time.time()
+        logger.info(f"Open order index seeded: {len(orders)} orders, {len(pending)} buffered updates replayed")
+        return self
+
+    def _upsert(self, order):
+        current = self._orders.get(order.order_id)
+        if current is not None and current.update_time > order.update_time:
+            return
+        self._remove(order.order_id)
+        if not order.is_terminal:
+            self._add(order)
+
+    def upsert(self, order):
+        with self._lock:
+            self._upsert(order)
+            self.updated_at = time.time()
+
+    def apply_event(self, event):
+        if event.get("e") != "ORDER_TRADE_UPDATE":
+            return
+        order = Order.from_stream(event.get("o", {}))
+        with self._lock:
+            if self._pending is not None:
+                self._pending.append(order)
+                return
+            self._upsert(order)
+            self.updated_at = time.time()
+
+    def subscribe(self):
+        from src.streams import UserDataStream
+
+        # subscribe before seeding: updates are buffered until the next seed() and
+        # replayed on top of the snapshot, so none fall between the two
+        with self._lock:
+            self._pending = []
+        self._stream = UserDataStream(self.client, self.apply_event).start()
+        return self
+
+    def close(self):
+        if self._stream is not None:
+            self._stream.stop()
+            self._stream = None
+
+    @property
+    def live(self):
+        return self._stream is not None
+
+    def get(self, order_id):
+        return self._orders.get(order_id)
+
+    def order_ids(self, symbol=None, side=None, price=None, strategy=None):
+        with self._lock:
+            if symbol is None:
+                candidates = [self._orders.keys()]
+            else:
+                symbol = symbol.upper()
+                candidates = [self._by_symbol.get(symbol, ())]
+            if side is not None:
+                candidates.append(self._by_side.get((symbol, side.upper()), ()))
+            if price is not None:
+                candidates.append(self._by_price.get((symbol, float(price)), ()))
+            if strategy is not None:
+                candidates.append(self._by_strategy.get(strategy, ()))
+            # scan the narrowest index and probe the others
+            smallest = min(candidates, key=len)
+            return {i for i in smallest if all(i in c for c in candidates)}
+
+    def orders(self, symbol=None, side=None, price=None, strategy=None):
+        ids = self.order_ids(symbol, side, price, strategy)
+        return [self._orders[i] for i in ids if i in self._orders]
+
+    def count(self, symbol=None, side=None, price=None, strategy=None):
+        return len(self.order_ids(symbol, side, price, strategy))
+
+    def symbols(self):
+        return sorted(self._by_symbol)
+
+    def strategies(self):
+        return sorted(self._by_strategy)
+
+    def levels(self, symbol):
+        symbol = symbol.upper()
+        with self._lock:
+            return {price: len(ids) for (s, price), ids in self._by_price.items() if s == symbol}
+
+    def summary(self, strategy=None):
+        rows = []
+        for symbol in self.symbols():
+            tags = {s: self.count(symbol, strategy=s) for s in self.strategies()}
+            rows.append({
+                "symbol": symbol,
+                "open_orders": self.count(symbol, strategy=strategy),
+                "buy_orders": self.count(symbol, side="BUY", strategy=strategy),
+                "sell_orders": self.count(symbol, side="SELL", strategy=strategy),
+                "price_levels": len(self.levels(symbol)),
+                "strategies": {s: n for s, n in tags.items() if n},
+            })
+        return [r for r in rows if r["open_orders"]]
+
+    def __len__(self):
+        return len(self._orders)
+
+
+def print_summary(rows):
+    print(f"{'SYMBOL':<12} {'OPEN':>5} {'BUY':>5} {'SELL':>5} {'LEVELS':>6}  STRATEGIES")
+    for r in rows:
+        tags = ", ".join(f"{s}={n}" for s, n in sorted(r["strategies"].items()))
+        print(f"{r['symbol']:<12} {r['open_orders']:>5} {r['buy_orders']:>5} {r['sell_orders']:>5} {r['price_levels']:>6}  {tags}")
+    print(f"Total open orders: {sum(r['open_orders'] for r in rows)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Open orders across all symbols from one snapshot")
+    parser.add_argument("--symbol", help="Only this symbol")
+    parser.add_argument("--strategy", help="Only this strategy tag")
+    args = parser.parse_args()
+
+    try:
+        index = OpenOrderIndex().seed()
+        rows = index.summary(args.strategy)
+        if args.symbol:
+            rows = [r for r in rows if r["symbol"] == args.symbol.upper()]
+        print_summary(rows)
+    except BinanceClientError as exc:
+        logger.error(f"Open order status failed: {str(exc)}")
+        print(f"Error: {exc}")
+
+
+if __name__ == "__main__":
+    main()
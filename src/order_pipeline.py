@@ -0,0 +1,167 @@
+import argparse
+import json
+import time
+from collections import deque
+from urllib.parse import urlencode
+
+from src.binance_client import BinanceFuturesClient
+from src.config import DEFAULT_POSITION_SIDE
+from src.tracing import traced
+from src.transport import Transport, Response
+from src.validator import validate_symbol, validate_side, validate_positive, validate_with_filters, quantize, step_sizes
+from src.logger_utils import get_logger
+
+logger = get_logger("order_pipeline")
+
+
+class PreparedOrder:
+    __slots__ = ("symbol", "side", "order_type", "quantity", "price", "query")
+
+    def __init__(self, symbol, side, order_type, quantity, price, query):
+        self.symbol = symbol
+        self.side = side
+        self.order_type = order_type
+        self.quantity = quantity
+        self.price = price
+        self.query = query
+
+
+class LatencyStats:
+    def __init__(self):
+        self.samples = []
+
+    def record(self, seconds):
+        self.samples.append(seconds)
+
+    def summary(self):
+        if not self.samples:
+            return {"count": 0, "mean_us": 0.0, "p50_us": 0.0, "p99_us": 0.0, "max_us": 0.0}
+        ordered = sorted(self.samples)
+        n = len(ordered)
+        return {
+            "count": n,
+            "mean_us": sum(ordered) / n * 1e6,
+            "p50_us": ordered[n // 2] * 1e6,
+            "p99_us": ordered[min(int(n * 0.99), n - 1)] * 1e6,
+            "max_us": ordered[-1] * 1e6,
+        }
+
+
+class OrderPipeline:
+    def __init__(self, client=None, depth=5):
+        self.client = client or BinanceFuturesClient()
+        self.depth = depth
+        self.stats = LatencyStats()
+        self._filters = {}
+        self._pending = deque()
+        self._ready = deque()
+
+    def symbol_filters(self, symbol):
+        filters = self._filters.get(symbol)
+        if filters is None:
+            filters = self.client.get_symbol_filters(symbol).get("filters", [])
+            self._filters[symbol] = filters
+        return filters
+
+    @traced("OrderPipeline.prepare")
+    def prepare(self, symbol, side, quantity, order_type="MARKET", price=None, time_in_force="GTC", position_side=None, reduce_only=False, client_order_id=None):
+        symbol = symbol.upper()
+        side = side.upper()
+        validate_symbol(symbol)
+        validate_side(side)
+
+        filters = self.symbol_filters(symbol)
+        step, tick = step_sizes(filters)
+        quantity = quantize(quantity, step)
+        validate_positive("quantity", quantity)
+        if price is not None:
+            price = quantize(price, tick)
+            validate_positive("price", price)
+        validate_with_filters(symbol, quantity, price, filters)
+
+        if price is None and not self.client.risk.has_mark(symbol):
+            self.client.risk.update_mark(symbol, self.client.get_mark_price(symbol))
+
+        params = {"symbol": symbol, "side": side, "type": order_type, "quantity": quantity}
+        if order_type != "MARKET":
+            params["timeInForce"] = time_in_force
+            params["price"] = price
+        params["reduceOnly"] = "true" if reduce_only else "false"
+        params["positionSide"] = position_side or DEFAULT_POSITION_SIDE
+        if client_order_id:
+            params["newClientOrderId"] = client_order_id
+        return PreparedOrder(symbol, side, order_type, quantity, price, urlencode(params))
+
+    def schedule(self, orders):
+        self._pending.extend(orders)
+        self.refill()
+
+    def refill(self):
+        while self._pending and len(self._ready) < self.depth:
+            self._ready.append(self.prepare(**self._pending.popleft()))
+
+    def fire(self):
+        return self.client.submit_prepared(self._ready.popleft(), self.stats)
+
+    def __len__(self):
+        return len(self._ready) + len(self._pending)
+
+
+class _NullTransport(Transport):
+    # answers instantly with canned payloads so only local work is measured
+    def __init__(self):
+        super().__init__()
+        filters = [
+            {"filterType": "LOT_SIZE", "minQty": "0.001", "stepSize": "0.001"},
+            {"filterType": "PRICE_FILTER", "minPrice": "0.1", "maxPrice": "1000000", "tickSize": "0.1"},
+            {"filterType": "MIN_NOTIONAL", "notional": "5"},
+        ]
+        self._info = json.dumps({"symbols": [{"symbol": "BTCUSDT", "filters": filters}]}).encode()
+        self._mark = json.dumps({"markPrice": "50000"}).encode()
+        self._order = json.dumps({"orderId": 1, "symbol": "BTCUSDT", "side": "BUY", "type": "MARKET", "status": "NEW",
+                                  "origQty": "0.010", "executedQty": "0", "avgPrice": "0"}).encode()
+
+    def send(self, method, url, params=None, headers=None):
+        if url.endswith("exchangeInfo"):
+            body = self._info
+        elif url.endswith("premiumIndex"):
+            body = self._mark
+        else:
+            body = self._order
+        return Response(200, body, 0.0)
+
+
+def benchmark(iterations=2000):
+    from src.risk import RiskEngine, RiskLimits
+
+    client = BinanceFuturesClient(transport=_NullTransport(), risk=RiskEngine(RiskLimits(max_orders_per_second=0, max_open_orders=0)))
+
+    before = LatencyStats()
+    for _ in range(iterations):
+        start = time.perf_counter()
+        client.place_market_order("BTCUSDT", "BUY", 0.01)
+        before.record(time.perf_counter() - start)
+
+    after = LatencyStats()
+    pipeline = OrderPipeline(client, depth=iterations)
+    pipeline.schedule({"symbol": "BTCUSDT", "side": "BUY", "quantity": 0.01} for _ in range(iterations))
+    while len(pipeline):
+        start = time.perf_counter()
+        pipeline.fire()
+        after.record(time.perf_counter() - start)
+    return before.summary(), after.summary()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare fire-time latency of direct vs prepared orders")
+    parser.add_argument("--iterations", type=int, default=2000, help="Orders per path")
+    args = parser.parse_args()
+
+    before, after = benchmark(args.iterations)
+    print(f"{'path':<10} {'mean us':>9} {'p50 us':>9} {'p99 us':>9} {'max us':>9}")
+    for name, s in (("direct", before), ("prepared", after)):
+        print(f"{name:<10} {s['mean_us']:>9.1f} {s['p50_us']:>9.1f} {s['p99_us']:>9.1f} {s['max_us']:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,239 @@
+import argparse
+import threading
+import time
+from collections import deque
+
+from src.config import (
+    RISK_MAX_ORDER_QTY,
+    RISK_MAX_ORDER_NOTIONAL,
+    RISK_MAX_POSITION_NOTIONAL,
+    RISK_MAX_GROSS_NOTIONAL,
+    RISK_MAX_ORDERS_PER_SECOND,
+    RISK_MAX_OPEN_ORDERS,
+    RISK_MAX_TOTAL_OPEN_ORDERS,
+)
+from src.models import FillTracker
+from src.validator import ValidationError
+from src.logger_utils import get_logger
+
+logger = get_logger("risk")
+
+
+class RiskLimitError(ValidationError):
+    pass
+
+
+class RiskLimits:
+    __slots__ = ("max_order_qty", "max_order_notional", "max_position_notional", "max_gross_notional", "max_orders_per_second", "max_open_orders",
+                 "max_total_open_orders")
+
+    def __init__(self, max_order_qty=RISK_MAX_ORDER_QTY, max_order_notional=RISK_MAX_ORDER_NOTIONAL,
+                 max_position_notional=RISK_MAX_POSITION_NOTIONAL, max_gross_notional=RISK_MAX_GROSS_NOTIONAL,
+                 max_orders_per_second=RISK_MAX_ORDERS_PER_SECOND, max_open_orders=RISK_MAX_OPEN_ORDERS,
+                 max_total_open_orders=RISK_MAX_TOTAL_OPEN_ORDERS):
+        # a limit of 0 disables that check
+        self.max_order_qty = max_order_qty
+        self.max_order_notional = max_order_notional
+        self.max_position_notional = max_position_notional
+        self.max_gross_notional = max_gross_notional
+        self.max_orders_per_second = max_orders_per_second
+        self.max_open_orders = max_open_orders
+        self.max_total_open_orders = max_total_open_orders
+
+    def override(self, **changes):
+        limits = RiskLimits(*(getattr(self, name) for name in self.__slots__))
+        for name, value in changes.items():
+            setattr(limits, name, value)
+        return limits
+
+
+class RiskEngine:
+    def __init__(self, limits=None, symbol_limits=None):
+        self.limits = limits or RiskLimits()
+        self.symbol_limits = {s.upper(): l for s, l in (symbol_limits or {}).items()}
+        self._positions = {}
+        self._marks = {}
+        self._notional = {}
+        self._gross = 0.0
+        self._open_ids = {}
+        self._open_total = 0
+        self._fills = FillTracker()
+        self._recent = deque()
+        self._lock = threading.Lock()
+
+    def _limits_for(self, symbol):
+        return self.symbol_limits.get(symbol, self.limits)
+
+    def check(self, symbol, side, quantity, price=None):
+        symbol = symbol.upper()
+        quantity = float(quantity)
+        limits = self._limits_for(symbol)
+        with self._lock:
+            if limits.max_order_qty and quantity > limits.max_order_qty:
+                raise RiskLimitError(f"quantity {quantity} > max order qty {limits.max_order_qty} for {symbol}")
+
+            ref_price = float(price) if price else self._marks.get(symbol, 0.0)
+            if ref_price:
+                notional = quantity * ref_price
+                if limits.max_order_notional and notional > limits.max_order_notional:
+                    raise RiskLimitError(f"order notional {notional:.2f} > max {limits.max_order_notional} for {symbol}")
+
+                position = self._positions.get(symbol, 0.0)
+                projected = position + quantity if side.upper() == "BUY" else position - quantity
+                if abs(projected) > abs(position):
+                    projected_notional = abs(projected) * ref_price
+                    if limits.max_position_notional and projected_notional > limits.max_position_notional:
+                        raise RiskLimitError(f"position notional {projected_notional:.2f} > max {limits.max_position_notional} for {symbol}")
+                    gross = self._gross - self._notional.get(symbol, 0.0) + projected_notional
+                    if self.limits.max_gross_notional and gross > self.limits.max_gross_notional:
+                        raise RiskLimitError(f"gross notional {gross:.2f} > max {self.limits.max_gross_notional}")
+
+            if limits.max_open_orders and len(self._open_ids.get(symbol, ())) >= limits.max_open_orders:
+                raise RiskLimitError(f"open orders for {symbol} at max {limits.max_open_orders}")
+            if self.limits.max_total_open_orders and self._open_total >= self.limits.max_total_open_orders:
+                raise RiskLimitError(f"open orders at max {self.limits.max_total_open_orders}")
+
+            if self.limits.max_orders_per_second:
+                now = time.monotonic()
+                recent = self._recent
+                while recent and now - recent[0] >= 1.0:
+                    recent.popleft()
+                if len(recent) >= self.limits.max_orders_per_second:
+                    raise RiskLimitError(f"order rate at max {self.limits.max_orders_per_second}/s")
+                recent.append(now)
+
+    def has_mark(self, symbol):
+        return symbol.upper() in self._marks
+
+    def needs_mark(self, symbol):
+        # only notional limits price a market order
+        limits = self._limits_for(symbol.upper())
+        return bool(limits.max_order_notional or limits.max_position_notional or self.limits.max_gross_notional)
+
+    def mark(self, symbol):
+        return self._marks.get(symbol.upper(), 0.0)
+
+    def update_mark(self, symbol, price):
+        with self._lock:
+            self._set_position(symbol.upper(), None, float(price))
+
+    def _set_position(self, symbol, position, mark):
+        if position is None:
+            position = self._positions.get(symbol, 0.0)
+        else:
+            self._positions[symbol] = position
+        if mark:
+            self._marks[symbol] = mark
+        notional = abs(position) * self._marks.get(symbol, 0.0)
+        self._gross += notional - self._notional.get(symbol, 0.0)
+        self._notional[symbol] = notional
+
+    def _apply_fill(self, symbol, side, quantity, price):
+        position = self._positions.get(symbol, 0.0)
+        position += quantity if side.upper() == "BUY" else -quantity
+        self._set_position(symbol, position, price)
+
+    def on_fill(self, symbol, side, quantity, price):
+        with self._lock:
+            self._apply_fill(symbol.upper(), side, float(quantity), float(price))
+
+    def on_order_update(self, order):
+        symbol = order.symbol
+        if symbol is None or order.order_id is None:
+            return
+        with self._lock:
+            delta = self._fills.delta(order)
+            if delta > 0:
+                self._apply_fill(symbol, order.side, delta, order.avg_price or order.price)
+            open_ids = self._open_ids.setdefault(symbol, set())
+            if order.is_terminal:
+                if order.order_id in open_ids:
+                    open_ids.discard(order.order_id)
+                    self._open_total -= 1
+            elif order.order_id not in open_ids:
+                open_ids.add(order.order_id)
+                self._open_total += 1
+
+    def seed_from_account(self, account, open_orders=()):
+        # replaces what this engine has tracked so far, so re-seeding never double-counts
+        positions = {}
+        marks = {}
+        for p in account.positions():
+            positions[p.symbol] = positions.get(p.symbol, 0.0) + p.amount
+            if p.mark_price or p.entry_price:
+                marks[p.symbol] = p.mark_price or p.entry_price
+        with self._lock:
+            self._positions = {}
+            self._notional = {}
+            self._gross = 0.0
+            self._marks.update(marks)
+            for symbol, amount in positions.items():
+                self._set_position(symbol, amount, marks.get(symbol))
+            self._open_ids = {}
+            for order in open_orders:
+                self._open_ids.setdefault(order.symbol, set()).add(order.order_id)
+            self._fills.reset(open_orders)
+            self._open_total = sum(len(ids) for ids in self._open_ids.values())
+
+    def open_orders(self, symbol=None):
+        if symbol is None:
+            return self._open_total
+        return len(self._open_ids.get(symbol.upper(), ()))
+
+    def position(self, symbol):
+        return self._positions.get(symbol.upper(), 0.0)
+
+    def gross_notional(self):
+        return self._gross
+
+
+_default_engine = None
+
+
+def get_default_risk_engine():
+    global _default_engine
+    if _default_engine is None:
+        _default_engine = RiskEngine()
+    return _default_engine
+
+
+def set_default_risk_engine(engine):
+    global _default_engine
+    _default_engine = engine
+
+
+def benchmark(iterations=100000, symbols=50):
+    from src.models import Order
+
+    engine = RiskEngine(RiskLimits(max_orders_per_second=0, max_open_orders=0, max_total_open_orders=0))
+    names = [f"SYM{i}USDT" for i in range(symbols)]
+    for name in names:
+        engine.update_mark(name, 100.0)
+
+    start = time.perf_counter()
+    for i in range(iterations):
+        engine.check(names[i % symbols], "BUY" if i & 1 else "SELL", 0.01, 100.0)
+    check_ns = (time.perf_counter() - start) / iterations * 1e9
+
+    orders = [Order(i, names[i % symbols], "BUY" if i & 1 else "SELL", "LIMIT", "FILLED", price=100.0, executed_qty=0.01, avg_price=100.0) for i in range(iterations)]
+    start = time.perf_counter()
+    for order in orders:
+        engine.on_order_update(order)
+    update_ns = (time.perf_counter() - start) / iterations * 1e9
+    return check_ns, update_ns
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark pre-trade risk checks")
+    parser.add_argument("--iterations", type=int, default=100000, help="Orders to check")
+    parser.add_argument("--symbols", type=int, default=50, help="Distinct symbols")
+    args = parser.parse_args()
+
+    check_ns, update_ns = benchmark(args.iterations, args.symbols)
+    print(f"check:          {check_ns / 1000:.2f} us/order")
+    print(f"fill update:    {update_ns / 1000:.2f} us/order")
+    print(f"total overhead: {(check_ns + update_ns) / 1000:.2f} us/order")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+import json
+import threading
+import time
+
+try:
+    import websocket
+except ImportError:
+    websocket = None
+
+from src.config import WS_BASE_URL, LISTEN_KEY_KEEPALIVE
+from src.binance_client import BinanceClientError
+from src.logger_utils import get_logger
+
+logger = get_logger("streams")
+
+
+class BinanceStream:
+    def __init__(self, path, on_message):
+        if websocket is None:
+            raise BinanceClientError("websocket-client is required for streaming (pip install websocket-client)")
+        self.url = f"{WS_BASE_URL}{path}"
+        self.on_message = on_message
+        self._ws = None
+        self._thread = None
+        self._stopped = threading.Event()
+
+    def _handle(self, ws, message):
+        try:
+            self.on_message(json.loads(message))
+        except Exception as exc:
+            logger.error(f"Stream handler failed: {exc}")
+
+    def _run(self):
+        while not self._stopped.is_set():
+            self._ws = websocket.WebSocketApp(self.url, on_message=self._handle)
+            self._ws.run_forever(ping_interval=60)
+            if not self._stopped.is_set():
+                logger.warning(f"Stream {self.url} disconnected, reconnecting")
+                time.sleep(1)
+
+    def start(self):
+        logger.info(f"Opening stream {self.url}")
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stopped.set()
+        if self._ws is not None:
+            self._ws.close()
+
+
+class UserDataStream:
+    def __init__(self, client, on_event):
+        self.client = client
+        self.on_event = on_event
+        self._stream = None
+        self._keepalive = None
+        self._stopped = threading.Event()
+
+    def _keepalive_loop(self):
+        while not self._stopped.wait(LISTEN_KEY_KEEPALIVE):
+            try:
+                self.client.keepalive_listen_key()
+            except BinanceClientError as exc:
+                logger.error(f"Listen key keepalive failed: {exc}")
+
+    def start(self):
+        listen_key = self.client.create_listen_key()
+        self._stream = BinanceStream(f"/ws/{listen_key}", self.on_event).start()
+        self._keepalive = threading.Thread(target=self._keepalive_loop, daemon=True)
+        self._keepalive.start()
+        return self
+
+    def stop(self):
+        self._stopped.set()
+        if self._stream is not None:
+            self._stream.stop()
+
+
+class MarketStream:
+    def __init__(self, symbol):
+        stream = symbol.lower()
+        self.symbol = symbol.upper()
+        self.bid = 0.0
+        self.ask = 0.0
+        self.volume = 0.0
+        self._ready = threading.Event()
+        self._stream = BinanceStream(f"/stream?streams={stream}@aggTrade/{stream}@bookTicker", self._on_message)
+
+    def _on_message(self, message):
+        data = message.get("data", message)
+        event = data.get("e")
+        if event == "aggTrade":
+            self.volume += float(data["q"])
+        elif event == "bookTicker":
+            self.bid = float(data["b"])
+            self.ask = float(data["a"])
+            self._ready.set()
+
+    @property
+    def mid(self):
+        return (self.bid + self.ask) / 2
+
+    def start(self, timeout=10):
+        self._stream.start()
+        if not self._ready.wait(timeout):
+            raise BinanceClientError(f"No book data for {self.symbol} within {timeout}s")
+        return self
+
+    def update(self):
+        pass
+
+    def stop(self):
+        self._stream.stop()
+
+
+class PolledMarket:
+    def __init__(self, client, symbol):
+        self.client = client
+        self.symbol = symbol.upper()
+        self.bid = 0.0
+        self.ask = 0.0
+        self.volume = 0.0
+        self._last_trade_id = None
+
+    @property
+    def mid(self):
+        return (self.bid + self.ask) / 2
+
+    def start(self):
+        trades = self.client.get_agg_trades(self.symbol, limit=1)
+        self._last_trade_id = trades[-1]["a"] if trades else None
+        self.update()
+        return self
+
+    def update(self):
+        book = self.client.get_book_ticker(self.symbol)
+        self.bid = float(book["bidPrice"])
+        self.ask = float(book["askPrice"])
+        from_id = self._last_trade_id + 1 if self._last_trade_id is not None else None
+        trades = self.client.get_agg_trades(self.symbol, from_id=from_id, limit=1000)
+        for t in trades:
+            self.volume += float(t["q"])
+        if trades:
+            self._last_trade_id = trades[-1]["a"]
+
+    def stop(self):
+        pass
+
+
+def open_market_feed(client, symbol):
+    if websocket is not None:
+        return MarketStream(symbol).start()
+    logger.info("websocket-client not installed, polling REST market data")
+    return PolledMarket(client, symbol).start()
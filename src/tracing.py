@@ -0,0 +1,173 @@
+import cProfile
+import functools
+import pstats
+import sys
+import threading
+import time
+
+_enabled = False
+_local = threading.local()
+_lock = threading.Lock()
+_spans = {}
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+def _stack():
+    stack = getattr(_local, "stack", None)
+    if stack is None:
+        stack = _local.stack = [()]
+    return stack
+
+
+def _record(path, elapsed):
+    with _lock:
+        entry = _spans.get(path)
+        if entry is None:
+            _spans[path] = [1, elapsed, elapsed]
+        else:
+            entry[0] += 1
+            entry[1] += elapsed
+            if elapsed > entry[2]:
+                entry[2] = elapsed
+
+
+class _Span:
+    __slots__ = ("path", "start")
+
+    def __init__(self, name):
+        stack = _stack()
+        self.path = stack[-1] + (name,)
+
+    def __enter__(self):
+        _stack().append(self.path)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        elapsed = time.perf_counter() - self.start
+        _stack().pop()
+        _record(self.path, elapsed)
+        return False
+
+
+def span(name):
+    # disabled tracing costs one global lookup and returns a shared no-op
+    if not _enabled:
+        return _NULL_SPAN
+    return _Span(name)
+
+
+def traced(name):
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return fn(*args, **kwargs)
+            with _Span(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def enable():
+    global _enabled
+    _enabled = True
+
+
+def disable():
+    global _enabled
+    _enabled = False
+
+
+def is_enabled():
+    return _enabled
+
+
+def reset():
+    with _lock:
+        _spans.clear()
+
+
+def summary():
+    with _lock:
+        items = sorted(_spans.items())
+    rows = []
+    for path, (count, total, peak) in items:
+        child_total = sum(v[1] for p, v in items if len(p) == len(path) + 1 and p[:-1] == path)
+        rows.append({
+            "path": path,
+            "count": count,
+            "total_ms": total * 1000,
+            "self_ms": max(total - child_total, 0.0) * 1000,
+            "mean_ms": total / count * 1000,
+            "max_ms": peak * 1000,
+        })
+    return rows
+
+
+def print_summary(stream=sys.stderr):
+    rows = summary()
+    if not rows:
+        return
+    print(f"{'SPAN':<44} {'COUNT':>6} {'TOTAL ms':>10} {'SELF ms':>10} {'MEAN ms':>9} {'MAX ms':>9}", file=stream)
+    for r in rows:
+        label = "  " * (len(r["path"]) - 1) + r["path"][-1]
+        print(f"{label:<44} {r['count']:>6} {r['total_ms']:>10.2f} {r['self_ms']:>10.2f} {r['mean_ms']:>9.3f} {r['max_ms']:>9.3f}", file=stream)
+
+
+def write_folded(path):
+    # collapsed-stack format, one "a;b;c <self us>" line per span, for flamegraph.pl / speedscope
+    with open(path, "w") as f:
+        for r in summary():
+            f.write(f"{';'.join(r['path'])} {int(r['self_ms'] * 1000)}\n")
+
+
+class Profiler:
+    # before 3.12 cProfile only sees the thread that enabled it, so threads started
+    # while profiling (grid and bulk workers) get their own profile, merged on stop
+    def __init__(self, path):
+        self.path = path
+        self._profile = cProfile.Profile()
+        self._threads = []
+        self._lock = threading.Lock()
+
+    def _profile_thread(self, frame, event, arg):
+        profile = cProfile.Profile()
+        with self._lock:
+            self._threads.append(profile)
+        # replaces this hook for the rest of the thread
+        profile.enable()
+
+    def start(self):
+        if sys.version_info < (3, 12):
+            threading.setprofile(self._profile_thread)
+        self._profile.enable()
+        return self
+
+    def stop(self):
+        self._profile.disable()
+        threading.setprofile(None)
+        stats = pstats.Stats(self._profile)
+        with self._lock:
+            for profile in self._threads:
+                stats.add(profile)
+        stats.dump_stats(self.path)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+        return False
@@ -0,0 +1,259 @@
+import argparse
+import sqlite3
+import time
+
+from src.binance_client import BinanceFuturesClient, BinanceClientError
+from src.config import HISTORY_DB_PATH
+from src.models import Fill
+from src.logger_utils import get_logger
+
+logger = get_logger("trade_history")
+
+PAGE_LIMIT = 1000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS trades (
+    symbol TEXT NOT NULL,
+    trade_id INTEGER NOT NULL,
+    order_id INTEGER NOT NULL,
+    side TEXT,
+    position_side TEXT,
+    price REAL,
+    qty REAL,
+    quote_qty REAL,
+    realized_pnl REAL,
+    commission REAL,
+    commission_asset TEXT,
+    maker INTEGER,
+    time INTEGER,
+    PRIMARY KEY (symbol, trade_id)
+);
+CREATE INDEX IF NOT EXISTS trades_order ON trades (symbol, order_id);
+CREATE INDEX IF NOT EXISTS trades_time ON trades (time);
+
+CREATE TABLE IF NOT EXISTS orders (
+    symbol TEXT NOT NULL,
+    order_id INTEGER NOT NULL,
+    client_order_id TEXT,
+    strategy TEXT NOT NULL,
+    side TEXT,
+    type TEXT,
+    status TEXT,
+    update_time INTEGER,
+    PRIMARY KEY (symbol, order_id)
+);
+CREATE INDEX IF NOT EXISTS orders_strategy ON orders (strategy);
+
+CREATE TABLE IF NOT EXISTS income (
+    tran_id INTEGER NOT NULL,
+    income_type TEXT NOT NULL,
+    symbol TEXT,
+    asset TEXT,
+    income REAL,
+    trade_id TEXT,
+    time INTEGER,
+    PRIMARY KEY (tran_id, income_type)
+);
+CREATE INDEX IF NOT EXISTS income_type_symbol ON income (income_type, symbol, time);
+
+CREATE TABLE IF NOT EXISTS cursors (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+"""
+
+TRADE_REPORT = """
+SELECT COALESCE(o.strategy, 'manual') AS strategy, t.symbol, COUNT(*), SUM(t.qty), SUM(t.quote_qty),
+       SUM(t.realized_pnl), SUM(t.commission)
+FROM trades t
+LEFT JOIN orders o ON o.symbol = t.symbol AND o.order_id = t.order_id
+WHERE t.time >= ? {filters}
+GROUP BY 1, 2
+ORDER BY 1, 2
+"""
+
+FUNDING_REPORT = """
+SELECT symbol, COUNT(*), SUM(income)
+FROM income
+WHERE income_type = 'FUNDING_FEE' AND time >= ? {filters}
+GROUP BY symbol
+ORDER BY symbol
+"""
+
+
+class TradeHistory:
+    def __init__(self, path=HISTORY_DB_PATH):
+        self.path = path
+        self.db = sqlite3.connect(path)
+        self.db.executescript(SCHEMA)
+
+    def close(self):
+        self.db.close()
+
+    def cursor(self, name, default=None):
+        row = self.db.execute("SELECT value FROM cursors WHERE name = ?", (name,)).fetchone()
+        return row[0] if row else default
+
+    def set_cursor(self, name, value):
+        self.db.execute("INSERT OR REPLACE INTO cursors (name, value) VALUES (?, ?)", (name, value))
+
+    def add_trades(self, fills):
+        return self.db.executemany(
+            "INSERT OR IGNORE INTO trades VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            [(f.symbol, f.trade_id, f.order_id, f.side, f.position_side, f.price, f.qty, f.quote_qty,
+              f.realized_pnl, f.commission, f.commission_asset, int(f.maker), f.time) for f in fills],
+        )
+
+    def add_orders(self, orders):
+        return self.db.executemany(
+            "INSERT OR REPLACE INTO orders VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            [(o.symbol, o.order_id, o.client_order_id, o.strategy, o.side, o.type, o.status, o.update_time) for o in orders],
+        )
+
+    def add_income(self, rows):
+        return self.db.executemany(
+            "INSERT OR IGNORE INTO income VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [(r["tranId"], r["incomeType"], r.get("symbol") or None, r.get("asset"), float(r["income"]),
+              r.get("tradeId") or None, r["time"]) for r in rows],
+        )
+
+    def symbols(self):
+        rows = self.db.execute(
+            "SELECT DISTINCT symbol FROM income WHERE symbol IS NOT NULL AND income_type IN ('COMMISSION', 'REALIZED_PNL') "
+            "UNION SELECT DISTINCT symbol FROM trades"
+        )
+        return sorted(r[0] for r in rows)
+
+    def report(self, since=0, symbol=None, strategy=None):
+        trade_filters, trade_args = "", [since]
+        funding_filters, funding_args = "", [since]
+        if symbol:
+            trade_filters += " AND t.symbol = ?"
+            trade_args.append(symbol.upper())
+            funding_filters += " AND symbol = ?"
+            funding_args.append(symbol.upper())
+        if strategy:
+            trade_filters += " AND COALESCE(o.strategy, 'manual') = ?"
+            trade_args.append(strategy)
+
+        trades = [
+            {"strategy": r[0], "symbol": r[1], "trades": r[2], "qty": r[3], "volume": r[4], "realized_pnl": r[5], "fees": r[6]}
+            for r in self.db.execute(TRADE_REPORT.format(filters=trade_filters), trade_args)
+        ]
+        funding = [
+            {"symbol": r[0], "payments": r[1], "funding": r[2]}
+            for r in self.db.execute(FUNDING_REPORT.format(filters=funding_filters), funding_args)
+        ]
+        return {"trades": trades, "funding": funding}
+
+
+class HistorySync:
+    def __init__(self, history=None, client=None):
+        self.history = history or TradeHistory()
+        self.client = client or BinanceFuturesClient()
+
+    def sync_income(self):
+        db = self.history
+        start = db.cursor("income", 0)
+        added = 0
+        while True:
+            rows = self.client.get_income(start_time=start, limit=PAGE_LIMIT)
+            if not rows:
+                break
+            added += db.add_income(rows).rowcount
+            last = max(r["time"] for r in rows)
+            # rows at the boundary millisecond are re-read next time and ignored by the primary key
+            start = last if last > start else start + 1
+            db.set_cursor("income", start)
+            db.db.commit()
+            if len(rows) < PAGE_LIMIT:
+                break
+        return added
+
+    def sync_trades(self, symbol):
+        db = self.history
+        name = f"trades:{symbol}"
+        from_id = db.cursor(name, -1) + 1
+        added = 0
+        while True:
+            fills = [Fill.from_dict(t) for t in self.client.get_user_trades(symbol, from_id=from_id, limit=PAGE_LIMIT)]
+            if not fills:
+                break
+            added += db.add_trades(fills).rowcount
+            from_id = max(f.trade_id for f in fills) + 1
+            db.set_cursor(name, from_id - 1)
+            db.db.commit()
+            if len(fills) < PAGE_LIMIT:
+                break
+        return added
+
+    def sync_orders(self, symbol):
+        db = self.history
+        name = f"orders:{symbol}"
+        order_id = db.cursor(name, 0)
+        added = 0
+        while True:
+            orders = self.client.get_all_orders(symbol, order_id=order_id, limit=PAGE_LIMIT)
+            if not orders:
+                break
+            added += db.add_orders(orders).rowcount
+            last = max(o.order_id for o in orders)
+            db.set_cursor(name, last)
+            db.db.commit()
+            if len(orders) < PAGE_LIMIT or last == order_id:
+                break
+            order_id = last
+        return added
+
+    def sync(self, symbols=None):
+        started = time.time()
+        income = self.sync_income()
+        symbols = sorted({s.upper() for s in symbols or []} | set(self.history.symbols()))
+        trades = orders = 0
+        for symbol in symbols:
+            try:
+                orders += self.sync_orders(symbol)
+                trades += self.sync_trades(symbol)
+            except BinanceClientError as exc:
+                logger.error(f"History sync failed for {symbol}: {exc}")
+        logger.info(f"History sync: {trades} trades, {orders} orders, {income} income rows in {time.time() - started:.1f}s")
+        return {"symbols": len(symbols), "trades": trades, "orders": orders, "income": income}
+
+
+def print_report(report):
+    print(f"{'STRATEGY':<10} {'SYMBOL':<12} {'TRADES':>7} {'VOLUME':>14} {'REALIZED PNL':>14} {'FEES':>12}")
+    for r in report["trades"]:
+        print(f"{r['strategy']:<10} {r['symbol']:<12} {r['trades']:>7} {r['volume']:>14.2f} {r['realized_pnl']:>14.4f} {r['fees']:>12.4f}")
+    if report["funding"]:
+        print()
+        print(f"{'SYMBOL':<12} {'PAYMENTS':>8} {'FUNDING':>12}")
+        for r in report["funding"]:
+            print(f"{r['symbol']:<12} {r['payments']:>8} {r['funding']:>12.4f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sync fills and income into a local store and report PnL")
+    parser.add_argument("action", choices=["sync", "report"], help="Action")
+    parser.add_argument("--db", default=HISTORY_DB_PATH, help="SQLite database path")
+    parser.add_argument("--symbols", nargs="*", default=[], help="Extra symbols to sync trades for")
+    parser.add_argument("--days", type=float, default=0, help="Report only the last N days (0 = all)")
+    parser.add_argument("--symbol", help="Report a single symbol")
+    parser.add_argument("--strategy", help="Report a single strategy tag")
+    args = parser.parse_args()
+
+    history = TradeHistory(args.db)
+    try:
+        if args.action == "sync":
+            print(HistorySync(history).sync(args.symbols))
+        else:
+            since = int((time.time() - args.days * 86400) * 1000) if args.days else 0
+            print_report(history.report(since, args.symbol, args.strategy))
+    except BinanceClientError as exc:
+        logger.error(f"History {args.action} failed: {str(exc)}")
+        print(f"Error: {exc}")
+    finally:
+        history.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+import gzip
+import json
+import threading
+import time
+from collections import defaultdict, deque
+from urllib.parse import parse_qsl, urlsplit
+
+import requests
+
+from src.logger_utils import get_logger
+
+logger = get_logger("transport")
+
+_UNRECORDED_PARAMS = ("signature", "timestamp", "recvWindow")
+_MATCH_PARAMS = ("symbol", "orderId")
+_ORDER_MATCH_PARAMS = ("side", "type", "price", "quantity")
+
+
+class TransportError(Exception):
+    pass
+
+
+class Response:
+    __slots__ = ("status_code", "content", "elapsed")
+
+    def __init__(self, status_code, content, elapsed):
+        self.status_code = status_code
+        self.content = content
+        self.elapsed = elapsed
+
+    @property
+    def text(self):
+        return self.content.decode("utf-8", errors="replace")
+
+
+class Transport:
+    def __init__(self):
+        self.requests = 0
+        self.latency = 0.0
+        self._stats_lock = threading.Lock()
+
+    def _observe(self, elapsed):
+        with self._stats_lock:
+            self.requests += 1
+            self.latency += elapsed
+
+    def send(self, method, url, params=None, headers=None):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class RequestsTransport(Transport):
+    def __init__(self, timeout=10):
+        super().__init__()
+        self.timeout = timeout
+        self.session = requests.Session()
+
+    def send(self, method, url, params=None, headers=None):
+        start = time.perf_counter()
+        try:
+            resp = self.session.request(method, url, params=params, headers=headers, timeout=self.timeout)
+        except requests.RequestException as exc:
+            raise TransportError(str(exc)) from exc
+        elapsed = time.perf_counter() - start
+        self._observe(elapsed)
+        return Response(resp.status_code, resp.content, elapsed)
+
+    def close(self):
+        self.session.close()
+
+
+class RecordingTransport(Transport):
+    def __init__(self, inner, path):
+        super().__init__()
+        self.inner = inner
+        self.path = path
+        self._file = gzip.open(path, "wt", encoding="utf-8")
+        self._lock = threading.Lock()
+        self._started = time.perf_counter()
+
+    def send(self, method, url, params=None, headers=None):
+        offset = time.perf_counter() - self._started
+        try:
+            resp = self.inner.send(method, url, params=params, headers=headers)
+        except TransportError as exc:
+            self._write({"t": round(offset, 6), "m": method, "u": urlsplit(url).path, "q": _recordable(params), "x": str(exc)})
+            raise
+        self._observe(resp.elapsed)
+        self._write({
+            "t": round(offset, 6),
+            "m": method,
+            "u": urlsplit(url).path,
+            "q": _recordable(params),
+            "s": resp.status_code,
+            "e": round(resp.elapsed, 6),
+            "b": resp.text,
+        })
+        return resp
+
+    def _write(self, record):
+        line = json.dumps(record, separators=(",", ":"))
+        with self._lock:
+            self._file.write(line + "\n")
+
+    def close(self):
+        self.inner.close()
+        with self._lock:
+            self._file.close()
+        logger.info(f"Recorded {self.requests} requests to {self.path}")
+
+
+class ReplayTransport(Transport):
+    def __init__(self, path, speed=1.0):
+        super().__init__()
+        self.path = path
+        self.speed = speed
+        self._records = defaultdict(deque)
+        self._lock = threading.Lock()
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            for line in f:
+                record = json.loads(line)
+                self._records[_match_key(record["m"], record["u"], record.get("q"))].append(record)
+
+    def send(self, method, url, params=None, headers=None):
+        key = _match_key(method, urlsplit(url).path, params)
+        with self._lock:
+            queue = self._records.get(key)
+            if not queue:
+                fields = " ".join(f"{name}={value}" for name, value in key[2])
+                raise TransportError(f"No recorded response for {method} {key[1]} {fields} in {self.path}")
+            record = queue.popleft()
+        if "x" in record:
+            raise TransportError(record["x"])
+        elapsed = record["e"]
+        if self.speed > 0:
+            time.sleep(elapsed / self.speed)
+        self._observe(elapsed)
+        return Response(record["s"], record["b"].encode("utf-8"), elapsed)
+
+    def remaining(self):
+        return sum(len(q) for q in self._records.values())
+
+
+def _recordable(params):
+    if not params:
+        return None
+    if isinstance(params, str):
+        return "&".join(p for p in params.split("&") if p.split("=", 1)[0] not in _UNRECORDED_PARAMS)
+    return {k: v for k, v in params.items() if k not in _UNRECORDED_PARAMS}
+
+
+def _match_key(method, path, params):
+    # symbol and orderId keep concurrent strategies from taking each other's responses;
+    # new orders also match on what they ask for, minus the random client order id
+    if not params:
+        params = {}
+    elif isinstance(params, str):
+        params = dict(parse_qsl(params))
+    names = _MATCH_PARAMS + _ORDER_MATCH_PARAMS if method == "POST" else _MATCH_PARAMS
+    fields = tuple((name, str(params[name])) for name in names if params.get(name) is not None)
+    if method == "POST" and params.get("batchOrders"):
+        orders = [{k: v for k, v in o.items() if k != "newClientOrderId"} for o in json.loads(params["batchOrders"])]
+        fields += (("batchOrders", json.dumps(orders, sort_keys=True, separators=(",", ":"))),)
+    return (method, path, fields)
+
+
+_default_transport = None
+
+
+def get_default_transport():
+    global _default_transport
+    if _default_transport is None:
+        _default_transport = RequestsTransport()
+    return _default_transport
+
+
+def set_default_transport(transport):
+    global _default_transport
+    _default_transport = transport
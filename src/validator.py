@@ -1,5 +1,7 @@
 from decimal import Decimal, ROUND_DOWN
 
+from src.tracing import traced
+
 
 class ValidationError(Exception):
     pass
@@ -31,6 +33,28 @@ def _apply_step(value, step):
     return (value // step) * step
 
 
+def quantize(value, step):
+    step = _decimal(step)
+    return float(_apply_step(_decimal(value), step)) if step > 0 else float(value)
+
+
+def step_sizes(filters):
+    lot_size = next((f for f in filters if f.get("filterType") == "LOT_SIZE"), None)
+    price_filter = next((f for f in filters if f.get("filterType") == "PRICE_FILTER"), None)
+    step = lot_size["stepSize"] if lot_size else "0"
+    tick = price_filter["tickSize"] if price_filter else "0"
+    return step, tick
+
+
+def min_order_size(filters):
+    lot_size = next((f for f in filters if f.get("filterType") == "LOT_SIZE"), None)
+    min_notional = next((f for f in filters if f.get("filterType") in ("MIN_NOTIONAL", "NOTIONAL")), None)
+    min_qty = float(lot_size["minQty"]) if lot_size else 0.0
+    notional = float(min_notional.get("notional") or min_notional.get("minNotional", "0")) if min_notional else 0.0
+    return min_qty, notional
+
+
+@traced("validate_with_filters")
 def validate_with_filters(symbol, quantity, price, filters):
     qty = _decimal(quantity)
     price_dec = _decimal(price) if price is not None else None